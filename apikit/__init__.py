@@ -0,0 +1,8 @@
+"""
+Code shared by the blogapi, todoapi and bookapi projects: view mixins,
+filtering, caching, query plan checks, profiling, the SQLite backend, the
+replica router and the load test harness.
+
+Each project's settings put this repository's root on sys.path and list
+'apikit' in INSTALLED_APPS, which adds the sync_replicas command.
+"""
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+from django.core import checks
+
+
+class ApikitConfig(AppConfig):
+    name = 'apikit'
+
+    def ready(self):
+        from .filters import check_filter_declarations
+        checks.register(check_filter_declarations, checks.Tags.urls)
@@ -0,0 +1,37 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def version_key(model):
+    return f'version:{model._meta.label_lower}'
+
+
+def get_version(model):
+    """
+    Return the current version of a model's data.  Any write to the model
+    bumps the version, so cache keys built from it go stale immediately.
+    """
+    # Seeded from the clock rather than 1, so that if the counter is ever
+    # evicted it can't restart at a version older entries were stored under.
+    return cache.get_or_set(version_key(model), time.time_ns(), timeout=None)
+
+
+def bump_version(model, using=None):
+    """
+    Move a model's data to a new version once the write on `using` commits.
+    Apps call this from their models' post_save and post_delete signals,
+    and bulk writes directly.
+
+    Bumping before the commit would let a concurrent read store the old
+    rows under the new version.
+    """
+    transaction.on_commit(lambda: _bump_version(model), using=using)
+
+
+def _bump_version(model):
+    try:
+        cache.incr(version_key(model))
+    except ValueError:
+        cache.set(version_key(model), time.time_ns(), timeout=None)
@@ -0,0 +1,48 @@
+"""
+A SQLite backend tuned for serving: set ENGINE to 'apikit.database', or
+build the whole DATABASES entry with sqlite_database().
+"""
+from pathlib import Path
+
+DEFAULT_PRAGMAS = {
+    # Readers and the writer don't block each other.
+    'journal_mode': 'wal',
+    # With WAL, syncing at checkpoints rather than at every commit can lose
+    # the last commits on power loss, but can't corrupt the database.
+    'synchronous': 'normal',
+    # A 64 MiB page cache (negative sizes are in KiB), and up to 256 MiB of
+    # the file memory-mapped instead of read.
+    'cache_size': -64000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'memory',
+}
+
+
+def sqlite_database(name, *, read_only=False, timeout=10, conn_max_age=600,
+                    pragmas=None, transaction_mode='IMMEDIATE'):
+    """
+    Return a DATABASES entry for the SQLite file `name`.
+
+    `timeout` is the busy timeout, in seconds: how long a connection waits
+    for another's write lock before failing with "database is locked".  A
+    read-only entry opens the same file read-only, and is a mirror of
+    'default' in tests.
+    """
+    options = {
+        'timeout': timeout,
+        'pragmas': {**DEFAULT_PRAGMAS, **(pragmas or {})},
+    }
+    if read_only:
+        options['read_only'] = True
+    else:
+        options['transaction_mode'] = transaction_mode
+    database = {
+        'ENGINE': 'apikit.database',
+        'NAME': Path(name),
+        'CONN_MAX_AGE': conn_max_age,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': options,
+    }
+    if read_only:
+        database['TEST'] = {'MIRROR': 'default'}
+    return database
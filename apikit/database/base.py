@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Django's SQLite backend, with three more OPTIONS:
+
+    - `pragmas`: a dict of PRAGMAs to set on every new connection.
+    - `transaction_mode`: how atomic blocks BEGIN.  With 'IMMEDIATE' they
+      take the write lock up front, so a block that reads before it writes
+      waits out the busy timeout like any other writer, instead of failing
+      with "database is locked" when another connection wrote in between.
+    - `read_only`: open the file read-only.
+    """
+    extra_options = ('pragmas', 'read_only', 'transaction_mode')
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        for name in self.extra_options:
+            params.pop(name, None)
+        if self.is_read_only():
+            params['database'] = Path(params['database']).resolve().as_uri() + '?mode=ro'
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.settings_dict['OPTIONS'].get('pragmas', {}).items():
+            # The journal mode is stored in the file, and only a writer can
+            # change it.
+            if name == 'journal_mode' and self.is_read_only():
+                continue
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict['OPTIONS'].get('transaction_mode')
+        if mode:
+            self.cursor().execute(f'BEGIN {mode}')
+        else:
+            super()._start_transaction_under_autocommit()
+
+    def is_read_only(self):
+        # In-memory test databases can't be opened read-only.
+        return bool(self.settings_dict['OPTIONS'].get('read_only')) and not self.is_in_memory_db()
@@ -0,0 +1,155 @@
+import datetime
+import sys
+
+from django.conf import settings
+from django.core import checks
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+
+SURROGATES = range(0xD800, 0xE000)
+
+
+def indexed_fields(model):
+    """
+    Return the names of the fields an index can filter or order on: those
+    with an index of their own, or leading a composite one.
+    """
+    names = {field.name for field in model._meta.concrete_fields
+             if field.primary_key or field.unique or field.db_index}
+    # Expression indexes, e.g. on Lower('title'), have no fields; they don't
+    # serve lookups on the column itself.
+    names.update(index.fields[0].lstrip('-') for index in model._meta.indexes
+                 if index.fields)
+    names.update(fields[0] for fields in model._meta.unique_together)
+    return names
+
+
+class IndexedFilterBackend(filters.BaseFilterBackend):
+    """
+    Filter and order lists on the fields a view declares:
+
+        filterset_fields = {'author': ['exact'], 'created_at': ['gte', 'lte']}
+        ordering_fields = ('created_at', 'id')
+
+    `?author=1`, `?created_at__gte=2024-01-01` and `?ordering=-created_at`
+    then apply.  Lookups are `exact`, `gt`, `gte`, `lt`, `lte` and `prefix`,
+    which is a range, so it can use the index too.  Only indexed fields can
+    be declared, so these queries always have an index to use; the
+    declarations of routed views are checked by `manage.py check`.
+    """
+    lookups = ('exact', 'gt', 'gte', 'lt', 'lte', 'prefix')
+    ordering_param = 'ordering'
+
+    def check_declarations(self, view, model):
+        """Return a system check error for each bad declaration of `view`."""
+        name = view.__name__ if isinstance(view, type) else type(view).__name__
+        errors = []
+        declared = set(getattr(view, 'filterset_fields', {}))
+        declared.update(getattr(view, 'ordering_fields', ()))
+        unindexed = declared - indexed_fields(model)
+        if unindexed:
+            errors.append(checks.Error(
+                f'{name} filters or orders on unindexed fields: {", ".join(sorted(unindexed))}',
+                obj=view, id='apikit.E001'))
+        for field, lookups in getattr(view, 'filterset_fields', {}).items():
+            for lookup in sorted(set(lookups) - set(self.lookups)):
+                errors.append(checks.Error(
+                    f'{name} declares unknown lookup {field}__{lookup}',
+                    obj=view, id='apikit.E002'))
+        return errors
+
+    def to_python(self, field, param, value):
+        try:
+            value = field.to_python(value)
+        except DjangoValidationError as exc:
+            raise ValidationError({param: exc.messages})
+        if (settings.USE_TZ and isinstance(value, datetime.datetime) and
+                timezone.is_naive(value)):
+            value = timezone.make_aware(value)
+        return value
+
+    def get_filters(self, request, view, model):
+        conditions = {}
+        for name, lookups in getattr(view, 'filterset_fields', {}).items():
+            field = model._meta.get_field(name)
+            for lookup in lookups:
+                param = name if lookup == 'exact' else f'{name}__{lookup}'
+                value = request.query_params.get(param)
+                if not value:
+                    continue
+                if lookup == 'prefix':
+                    conditions.update(
+                        self.get_prefix_conditions(field, self.to_python(field, param, value)))
+                else:
+                    conditions[f'{field.attname}__{lookup}'] = self.to_python(field, param, value)
+        return conditions
+
+    def get_prefix_conditions(self, field, value):
+        """
+        Everything from the prefix up to its successor, which an index can
+        range-scan where LIKE can't always.  The successor increments the
+        last character that can be incremented, skipping surrogates, and
+        drops those after it; with none, fall back to startswith.
+        """
+        for end in range(len(value), 0, -1):
+            code = ord(value[end - 1]) + 1
+            if code > sys.maxunicode:
+                continue
+            if code in SURROGATES:
+                code = SURROGATES.stop
+            return {f'{field.attname}__gte': value,
+                    f'{field.attname}__lt': value[:end - 1] + chr(code)}
+        return {f'{field.attname}__startswith': value}
+
+    def get_default_ordering(self, view):
+        ordering = getattr(view, 'ordering', None) or getattr(
+            view.pagination_class, 'ordering', None) or ()
+        return (ordering,) if isinstance(ordering, str) else tuple(ordering)
+
+    def get_ordering(self, request, queryset, view):
+        # Also consulted by CursorPagination, in place of its own ordering.
+        value = request.query_params.get(self.ordering_param)
+        if not value:
+            return self.get_default_ordering(view)
+        allowed = getattr(view, 'ordering_fields', ())
+        ordering = [term.strip() for term in value.split(',') if term.strip()]
+        invalid = [term for term in ordering if term.lstrip('-') not in allowed]
+        if invalid:
+            raise ValidationError(
+                {self.ordering_param: [f'Cannot order by: {term}' for term in invalid]})
+        # The primary key makes the order total.
+        if not {'id', '-id', 'pk', '-pk'} & set(ordering):
+            ordering.append('-pk' if ordering[0].startswith('-') else 'pk')
+        return tuple(ordering)
+
+    def filter_queryset(self, request, queryset, view):
+        queryset = queryset.filter(**self.get_filters(request, view, queryset.model))
+        if request.query_params.get(self.ordering_param):
+            queryset = queryset.order_by(*self.get_ordering(request, queryset, view))
+        return queryset
+
+
+def iter_views(patterns):
+    """Yield the class of each DRF view routed by `patterns`."""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_views(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and hasattr(pattern.callback, 'cls'):
+            yield pattern.callback.cls
+
+
+def check_filter_declarations(app_configs=None, **kwargs):
+    """Check the declarations of every routed view that uses IndexedFilterBackend."""
+    errors = []
+    for view in dict.fromkeys(iter_views(get_resolver().url_patterns)):
+        queryset = getattr(view, 'queryset', None)
+        backends = getattr(view, 'filter_backends', ())
+        if queryset is None or not any(issubclass(backend, IndexedFilterBackend)
+                                       for backend in backends):
+            continue
+        errors.extend(IndexedFilterBackend().check_declarations(view, queryset.model))
+    return errors
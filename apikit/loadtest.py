@@ -0,0 +1,153 @@
+import http.client
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.core.servers.basehttp import (
+    ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application,
+)
+from django.db import connections
+from django.test.utils import modify_settings
+
+from .profiling import percentiles
+
+# `request(rng)` returns the (method, path, data, headers) of one request;
+# data is sent as JSON.  Responses with other statuses than `expected`
+# count as errors.
+Endpoint = namedtuple('Endpoint', 'name weight request expected',
+                      defaults=(range(200, 400),))
+
+
+@contextmanager
+def load_test_database(alias='default'):
+    """
+    Create and migrate a throwaway database for a load test, in a temporary
+    file rather than in memory when it's SQLite, so that the server's
+    threads share it, and point its test mirrors at it.  It's destroyed
+    afterwards.
+    """
+    connection = connections[alias]
+    mirrors = [connections[name] for name in connections
+               if connections[name].settings_dict['TEST'].get('MIRROR') == alias]
+    with tempfile.TemporaryDirectory() as directory:
+        if connection.vendor == 'sqlite':
+            connection.settings_dict['TEST'] = {
+                **connection.settings_dict.get('TEST', {}),
+                'NAME': os.path.join(directory, 'loadtest.sqlite3'),
+            }
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        mirror_names = [mirror.settings_dict['NAME'] for mirror in mirrors]
+        for mirror in mirrors:
+            mirror.creation.set_as_test_mirror(connection.settings_dict)
+        try:
+            yield
+        finally:
+            for mirror, name in zip(mirrors, mirror_names):
+                mirror.close()
+                mirror.settings_dict['NAME'] = name
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def live_server(host='localhost', port=0):
+    """Serve the project's WSGI application from a thread; yield its address."""
+    server = ThreadedWSGIServer((host, port), QuietWSGIRequestHandler, allow_reuse_address=False)
+    server.set_app(get_internal_wsgi_application())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    # Keep server errors' tracebacks, but not a warning for every 4xx.
+    logger = logging.getLogger('django.request')
+    level = logger.level
+    logger.setLevel(logging.ERROR)
+    # Clients connect to the bound address, so that's the Host they send.
+    address = server.server_address[:2]
+    with modify_settings(ALLOWED_HOSTS={'append': [host, address[0]]}):
+        thread.start()
+        try:
+            yield address
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+            logger.setLevel(level)
+
+
+def run(address, endpoints, requests, concurrency, seed=0):
+    """
+    Send `requests` requests to `address`, picking endpoints by weight, from
+    `concurrency` clients that each keep a connection open.  Return the
+    (milliseconds, ok) samples per endpoint name, and the elapsed seconds.
+    """
+    samples = defaultdict(list)
+    lock = threading.Lock()
+    weights = [endpoint.weight for endpoint in endpoints]
+
+    def client(number, count):
+        rng = random.Random(seed + number)
+        connection = http.client.HTTPConnection(*address, timeout=60)
+        try:
+            for endpoint in rng.choices(endpoints, weights, k=count):
+                method, path, data, headers = endpoint.request(rng)
+                body = None
+                if data is not None:
+                    body = json.dumps(data)
+                    headers = {**headers, 'Content-Type': 'application/json'}
+                start = time.perf_counter()
+                try:
+                    connection.request(method, path, body, headers)
+                    response = connection.getresponse()
+                    response.read()
+                    ok = response.status in endpoint.expected
+                except (OSError, http.client.HTTPException):
+                    connection.close()
+                    ok = False
+                elapsed = (time.perf_counter() - start) * 1000
+                with lock:
+                    samples[endpoint.name].append((elapsed, ok))
+        finally:
+            connection.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        counts = [requests // concurrency + (n < requests % concurrency) for n in range(concurrency)]
+        for future in [executor.submit(client, n, count) for n, count in enumerate(counts)]:
+            future.result()
+    return dict(samples), time.perf_counter() - start
+
+
+def summarize(samples, elapsed):
+    """Throughput, errors and latency percentiles per endpoint and overall."""
+    summary = {}
+    everything = [sample for values in samples.values() for sample in values]
+    for name, values in sorted(samples.items()) + [('all', everything)]:
+        if not values:
+            continue
+        summary[name] = {
+            'requests': len(values),
+            'errors': sum(not ok for _, ok in values),
+            'rps': round(len(values) / elapsed, 1),
+            **percentiles([latency for latency, _ in values]),
+        }
+    return summary
+
+
+def format_summary(summary):
+    width = max(len(name) for name in summary)
+    lines = [f'{"endpoint":<{width}}  requests  errors      rps     p50     p95     p99']
+    for name, row in summary.items():
+        lines.append(f'{name:<{width}}  {row["requests"]:>8}  {row["errors"]:>6}  '
+                     f'{row["rps"]:>7.1f}  {row["p50"]:>6.1f}  {row["p95"]:>6.1f}  {row["p99"]:>6.1f}')
+    return '\n'.join(lines)
@@ -0,0 +1,63 @@
+import sqlite3
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from apikit.routers import HEARTBEAT_TABLE
+
+
+class Command(BaseCommand):
+    help = ('Copy the database onto each of DATABASE_REPLICAS that is a separate '
+            'SQLite file, and stamp the copy with the time it was taken, which '
+            'ReplicaRouter measures replica lag from.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float,
+            help='Copy again every this many seconds, until interrupted.',
+        )
+
+    def handle(self, *args, interval, **options):
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != 'sqlite':
+            raise CommandError('Only SQLite databases can be copied to replicas.')
+        aliases = [alias for alias in getattr(settings, 'DATABASE_REPLICAS', ())
+                   if self.get_copy_path(alias) is not None]
+        if not aliases:
+            raise CommandError('None of DATABASE_REPLICAS is a copy of the database.')
+        while True:
+            for alias in aliases:
+                self.sync(primary, alias)
+            if not interval:
+                break
+            time.sleep(interval)
+
+    def get_copy_path(self, alias):
+        """Return the file `alias` reads, unless it's the primary's own file."""
+        name = connections[alias].settings_dict['NAME']
+        if connections[alias].is_in_memory_db():
+            return None
+        path = Path(name).resolve()
+        if path == Path(connections[DEFAULT_DB_ALIAS].settings_dict['NAME']).resolve():
+            return None
+        return path
+
+    def sync(self, primary, alias):
+        # Stamp the copy with the time it started, which is as old as its
+        # rows can be.
+        synced_at = time.time()
+        primary.ensure_connection()
+        target = sqlite3.connect(self.get_copy_path(alias))
+        try:
+            primary.connection.backup(target)
+            with target:
+                target.execute(f'CREATE TABLE IF NOT EXISTS {HEARTBEAT_TABLE} '
+                               f'(synced_at REAL NOT NULL)')
+                target.execute(f'DELETE FROM {HEARTBEAT_TABLE}')
+                target.execute(f'INSERT INTO {HEARTBEAT_TABLE} VALUES (?)', [synced_at])
+        finally:
+            target.close()
+        self.stdout.write(f'{alias}: copied in {time.time() - synced_at:.2f} s')
@@ -0,0 +1,508 @@
+import hashlib
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Count, Max
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework import serializers, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+from .cache import bump_version, get_version
+from .routers import read_from_primary
+
+
+def get_list_ordering(view, queryset):
+    """Return the fields a list view's paginator orders by, without signs."""
+    paginator = view.paginator
+    if hasattr(paginator, 'get_ordering'):
+        ordering = paginator.get_ordering(view.request, queryset, view)
+    else:
+        ordering = getattr(paginator, 'ordering', None) or ()
+    if isinstance(ordering, str):
+        ordering = (ordering,)
+    return [field.lstrip('-') for field in ordering]
+
+
+class CachedListMixin:
+    """
+    Serve list responses from the cache without touching the ORM.
+
+    Entries are keyed on the path, query parameters, the user's permission
+    scope and the current version of every model in `cache_models`, so any
+    write to those models makes the entries unreachable, and the cache's
+    LRU culling drops them.
+
+    Misses are read from the primary database: a replica may not have the
+    write that moved the version on yet, and an entry filled from it would
+    serve the old rows, even to the writer, for `cache_timeout`.
+    """
+    cache_models = ()
+    cache_timeout = 300
+    cached_headers = ('ETag', 'Last-Modified')
+
+    def list(self, request, *args, **kwargs):
+        key = self.get_list_cache_key(request)
+        cached = cache.get(key)
+        if cached is None:
+            with read_from_primary():
+                response = super().list(request, *args, **kwargs)
+            # Streamed lists are never materialized, so there's nothing to store.
+            if response.status_code == 200 and not response.streaming:
+                headers = {name: response[name]
+                           for name in self.cached_headers if name in response}
+                cache.set(key, (response.data, headers), self.cache_timeout)
+            return response
+
+        data, headers = cached
+        if headers:
+            not_modified = get_conditional_response(
+                request,
+                etag=headers.get('ETag'),
+                last_modified=parse_http_date_safe(headers.get('Last-Modified')),
+            )
+            if not_modified is not None:
+                for name, value in headers.items():
+                    not_modified[name] = value
+                return not_modified
+        return Response(data, headers=headers)
+
+    def get_permission_scope(self, request):
+        if request.user.is_staff:
+            return 'staff'
+        if request.user.is_authenticated:
+            return 'user'
+        return 'anonymous'
+
+    def get_list_cache_key(self, request):
+        parts = [
+            request.get_host(),
+            request.path,
+            '&'.join(sorted(request.GET.urlencode().split('&'))),
+            self.get_permission_scope(request),
+            request.accepted_renderer.format,
+        ]
+        parts.extend(str(get_version(model)) for model in self.cache_models)
+        return 'api:' + hashlib.md5('|'.join(parts).encode()).hexdigest()
+
+
+class ConditionalGetMixin:
+    """
+    Answer conditional GETs with 304 Not Modified before running the
+    serializer.
+
+    Lists are validated with one aggregate query (the latest
+    `last_modified_field` and the row count, so edits and deletes both
+    change the ETag), and details with the object's own timestamp.
+    """
+    last_modified_field = 'updated_at'
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        state = queryset.aggregate(
+            last_modified=Max(self.last_modified_field), count=Count('pk'))
+        etag = self.get_etag(request, state['last_modified'], state['count'])
+        not_modified = self.get_not_modified(request, etag, state['last_modified'])
+        if not_modified is not None:
+            return not_modified
+        response = super().list(request, *args, **kwargs)
+        return self.set_validators(response, etag, state['last_modified'])
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        last_modified = getattr(instance, self.last_modified_field)
+        etag = self.get_etag(request, last_modified, instance.pk)
+        not_modified = self.get_not_modified(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        serializer = self.get_serializer(instance)
+        response = Response(serializer.data)
+        return self.set_validators(response, etag, last_modified)
+
+    def get_etag(self, request, last_modified, *state):
+        # The full path covers cursors and any other query parameters.
+        parts = [request.get_full_path(), request.accepted_renderer.format,
+                 last_modified.isoformat() if last_modified else '']
+        parts.extend(str(value) for value in state)
+        return quote_etag(hashlib.md5('|'.join(parts).encode()).hexdigest())
+
+    def get_not_modified(self, request, etag, last_modified):
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        if response is not None:
+            return self.set_validators(response, etag, last_modified)
+        return None
+
+    def set_validators(self, response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        return response
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Accept a `fields` argument naming the subset of the serializer's fields
+    to render.
+    """
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsMixin:
+    """
+    Restrict GET responses to the fields listed in `?fields=`, and load only
+    the matching columns.  The serializer must use SparseFieldsSerializerMixin.
+
+    The primary key, the pagination ordering and `last_modified_field` are
+    always loaded, since reading a deferred column costs a query per object.
+    """
+    fields_param = 'fields'
+
+    def get_requested_fields(self):
+        if self.request.method not in ('GET', 'HEAD'):
+            return None
+        value = self.request.query_params.get(self.fields_param)
+        if not value:
+            return None
+        fields = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in fields
+                   if name not in self.get_serializer_class().Meta.fields]
+        if unknown:
+            raise ValidationError(
+                {self.fields_param: [f'Unknown field: {name}' for name in unknown]})
+        return fields
+
+    def get_required_columns(self):
+        columns = ['pk']
+        columns.extend(get_list_ordering(self, self.queryset))
+        if getattr(self, 'last_modified_field', None):
+            columns.append(self.last_modified_field)
+        return columns
+
+    def get_columns(self):
+        """Return the columns to load, or None to load all of them."""
+        fields = self.get_requested_fields()
+        if fields is None:
+            return None
+        return list(dict.fromkeys(self.get_required_columns() + fields))
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        columns = self.get_columns()
+        if columns is not None:
+            queryset = queryset.only(*columns)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs['fields'] = fields
+        return super().get_serializer(*args, **kwargs)
+
+
+class ValuesListMixin:
+    """
+    Serve lists straight from values_list() rows when every field of the
+    serializer renders a plain column, skipping model instantiation and
+    most per-field serialization.  Any other serializer takes the normal path.
+    """
+    flat_field_types = (serializers.BooleanField, serializers.CharField,
+                        serializers.IntegerField)
+    # Fields whose columns go through the field's to_representation().
+    converted_field_types = (serializers.DateTimeField,)
+    use_values_list = True
+
+    def get_flat_columns(self, serializer):
+        """Return the column for each field, or None if any isn't flat."""
+        if type(serializer).to_representation is not serializers.Serializer.to_representation:
+            return None
+        columns = []
+        for field in serializer.fields.values():
+            if isinstance(field, serializers.PrimaryKeyRelatedField):
+                # values_list() yields the foreign key column, i.e. the pk.
+                flat = field.pk_field is None
+            elif isinstance(field, serializers.BigIntegerField):
+                flat = not getattr(field, 'coerce_to_string',
+                                   api_settings.COERCE_BIGINT_TO_STRING)
+            else:
+                flat = type(field) in self.flat_field_types + self.converted_field_types
+            if not flat or field.source in ('*', 'pk') or '.' in field.source:
+                return None
+            columns.append(field.source)
+        return columns
+
+    def get_row_representer(self, serializer):
+        """
+        Return a function from a row of get_flat_columns() (and any columns
+        after them) to the serializer's representation.
+        """
+        keys = tuple(serializer.fields)
+        converters = [(key, field.to_representation) for key, field in serializer.fields.items()
+                      if type(field) in self.converted_field_types]
+
+        def to_representation(row):
+            item = dict(zip(keys, row))
+            for key, convert in converters:
+                if item[key] is not None:
+                    item[key] = convert(item[key])
+            return item
+        return to_representation
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        columns = self.get_flat_columns(serializer) if self.use_values_list else None
+        if columns is None:
+            return super().list(request, *args, **kwargs)
+
+        # Cursor pagination reads its position from the ordering columns,
+        # so they are selected too, and rows are named tuples.
+        queryset = self.filter_queryset(self.get_queryset())
+        extra = [field for field in get_list_ordering(self, queryset) if field not in columns]
+        rows = queryset.values_list(*columns, *extra, named=True)
+
+        to_representation = self.get_row_representer(serializer)
+        page = self.paginate_queryset(rows)
+        data = [to_representation(row) for row in (rows if page is None else page)]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class StreamingListMixin:
+    """
+    Stream unpaginated JSON lists when the client asks with `?stream=1`.
+    Rows are read with a server-side cursor (QuerySet.iterator()) and
+    serialized and encoded one at a time, so memory use doesn't grow with
+    the result set and the response starts before the last row is read.
+
+    It's opt-in because the rows are read after the middleware has
+    returned: outside ProfilingMiddleware and ReplicaMiddleware, so from
+    the primary database and unprofiled.  CachedListMixin can't store a
+    streamed list either, and under ASGI Django buffers it anyway.
+
+    Put it before ValuesListMixin, whose flat rows it streams as well.
+    """
+    stream_param = 'stream'
+    stream_chunk_size = 2000
+
+    def wants_stream(self, request):
+        return (self.paginator is None and request.accepted_renderer.format == 'json' and
+                request.query_params.get(self.stream_param) in ('1', 'true'))
+
+    def list(self, request, *args, **kwargs):
+        if not self.wants_stream(request):
+            return super().list(request, *args, **kwargs)
+        serializer = self.get_serializer()
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingHttpResponse(
+            self.stream_json(self.iter_representations(queryset, serializer)),
+            content_type='application/json',
+        )
+
+    def iter_representations(self, queryset, serializer):
+        columns = None
+        if isinstance(self, ValuesListMixin) and self.use_values_list:
+            columns = self.get_flat_columns(serializer)
+        if columns is None:
+            for instance in queryset.iterator(chunk_size=self.stream_chunk_size):
+                yield serializer.to_representation(instance)
+        else:
+            to_representation = self.get_row_representer(serializer)
+            rows = queryset.values_list(*columns)
+            for row in rows.iterator(chunk_size=self.stream_chunk_size):
+                yield to_representation(row)
+
+    def stream_json(self, items):
+        # Encoded like JSONRenderer's compact output.
+        encode = encoders.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+        yield b'['
+        separator = ''
+        chunk = []
+        for item in items:
+            chunk.append(encode(item))
+            if len(chunk) == self.stream_chunk_size:
+                yield (separator + ','.join(chunk)).encode()
+                separator = ','
+                chunk = []
+        if chunk:
+            yield (separator + ','.join(chunk)).encode()
+        yield b']'
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    Write a whole batch with one bulk_create() or bulk_update() in a
+    transaction, instead of a query per item.  Neither sends model signals,
+    so the model's cache version is bumped here, when the caller's
+    transaction commits.
+    """
+    batch_size = 500
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        instances = [model(**attrs) for attrs in validated_data]
+        with transaction.atomic():
+            model.objects.bulk_create(instances, batch_size=self.batch_size)
+            bump_version(model)
+        return instances
+
+    def update(self, instances, validated_data):
+        model = self.child.Meta.model
+        fields = set()
+        for instance, attrs in zip(instances, validated_data):
+            for name, value in attrs.items():
+                setattr(instance, name, value)
+            fields.update(attrs)
+        # auto_now fields are set by pre_save(), which bulk_update() skips.
+        now = timezone.now()
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False):
+                fields.add(field.name)
+                for instance in instances:
+                    setattr(instance, field.attname, now)
+        if fields:
+            with transaction.atomic():
+                model.objects.bulk_update(instances, fields, batch_size=self.batch_size)
+                bump_version(model)
+        return instances
+
+
+class BulkWriteMixin:
+    """
+    Create (POST) or partially update (PATCH) a list of objects in one
+    request.  The batch is validated as a whole: if any item is invalid
+    nothing is written and the response lists each item's errors, in order.
+    Otherwise it lists each written object.
+
+    `bulk_serializer_class` must use BulkListSerializer.  Updates look up
+    every item's `id` in one query, through `bulk_filter_backends`.
+    """
+    bulk_serializer_class = None
+    bulk_filter_backends = ()
+    bulk_max_items = 1000
+
+    def get_bulk_serializer(self, *args, **kwargs):
+        kwargs.setdefault('context', self.get_serializer_context())
+        return self.bulk_serializer_class(
+            *args, many=True, max_length=self.bulk_max_items, **kwargs)
+
+    def get_bulk_instances(self, items):
+        """Return the instance for each item's id, in order."""
+        if not isinstance(items, list) or len(items) > self.bulk_max_items:
+            # Rejected with the usual message by the list serializer.
+            return []
+        queryset = self.get_queryset()
+        for backend in self.bulk_filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        pk_field = queryset.model._meta.pk
+        pks = []
+        for item in items:
+            try:
+                pks.append(pk_field.to_python(item['id']))
+            except (KeyError, TypeError, DjangoValidationError):
+                pks.append(None)
+        found = queryset.in_bulk([pk for pk in pks if pk is not None])
+        errors = [{} if pk in found else {'id': ['Not found.']} for pk in pks]
+        if any(errors):
+            raise ValidationError(errors)
+        return [found[pk] for pk in pks]
+
+    def bulk_create(self, request, *args, **kwargs):
+        serializer = self.get_bulk_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_bulk_create(serializer)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def perform_bulk_create(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def bulk_update(self, request, *args, **kwargs):
+        instances = self.get_bulk_instances(request.data)
+        serializer = self.get_bulk_serializer(instances, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        self.perform_bulk_update(serializer)
+        return Response(serializer.data)
+
+    def perform_bulk_update(self, serializer):
+        serializer.save()
+
+
+class AsyncViewMixin:
+    """
+    Run a generic view's handlers, `alist()` and `aretrieve()`, as
+    coroutines, so that under ASGI a request only holds a thread while one
+    of its queries runs, rather than from start to finish.
+
+    Objects are read with the async ORM, except pages, since DRF's
+    paginators use the sync ORM.  Authentication, which looks sessions and
+    tokens up, runs in a thread when the view has authenticators; permission
+    classes must not query the database.  Under WSGI, Django runs these
+    views in an event loop of their own, so keep the sync views there.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            if request.authenticators:
+                await sync_to_async(self.perform_authentication)(request)
+            self.initial(request, *args, **kwargs)
+            method = request.method.lower()
+            if method in self.http_method_names:
+                handler = getattr(self, method, self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            # DRF's OPTIONS handler is synchronous.
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.paginator is not None:
+            # DRF's paginators read the page with the sync ORM.
+            page = await sync_to_async(self.paginate_queryset)(queryset)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer([obj async for obj in queryset], many=True)
+        return Response(serializer.data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        serializer = self.get_serializer(await self.aget_object())
+        return Response(serializer.data)
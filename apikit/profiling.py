@@ -0,0 +1,204 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+# Collapses IN lists, so lookups of differently sized batches share a shape.
+IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+
+
+class RequestProfile:
+    """
+    The timings of one request.  Also an execute wrapper, which counts and
+    times every query and tallies their shapes (the SQL before parameters).
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.view_start = self.render_start = None
+        self.view_sql_time = self.render_sql_time = 0.0
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.sql_count += 1
+            self.shapes[IN_LIST_RE.sub('IN (...)', sql)] += 1
+
+    def repeated_shapes(self, threshold):
+        return {shape: count for shape, count in self.shapes.items() if count >= threshold}
+
+    def get_metrics(self, response):
+        """Return the request's metrics; durations are in milliseconds."""
+        end = time.perf_counter()
+        metrics = {
+            'total': (end - self.start) * 1000,
+            'sql': self.sql_time * 1000,
+            'sql_count': self.sql_count,
+        }
+        if self.view_start is not None and self.render_start is not None:
+            # The view's own time, less its queries.  For these views that
+            # is almost all serialization.
+            view_time = self.render_start - self.view_start
+            metrics['serialize'] = (view_time - (self.render_sql_time - self.view_sql_time)) * 1000
+            metrics['render'] = (end - self.render_start) * 1000
+        if not response.streaming:
+            metrics['size'] = len(response.content)
+        return metrics
+
+
+class ProfileStats:
+    """The last `window` requests' metrics for each view."""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._n_plus_one = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, view, metrics, n_plus_one=False):
+        with self._lock:
+            self._samples[view].append(metrics)
+            if n_plus_one:
+                self._n_plus_one[view] += 1
+
+    def summary(self):
+        with self._lock:
+            samples = {view: list(values) for view, values in self._samples.items()}
+            n_plus_one = dict(self._n_plus_one)
+        summary = {}
+        for view, values in samples.items():
+            names = sorted({name for metrics in values for name in metrics})
+            summary[view] = {
+                'requests': len(values),
+                'n_plus_one': n_plus_one.get(view, 0),
+                'metrics': {
+                    name: percentiles([metrics[name] for metrics in values if name in metrics])
+                    for name in names
+                },
+            }
+        return summary
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._n_plus_one.clear()
+
+
+def percentiles(values, points=(50, 95, 99)):
+    """Nearest-rank percentiles of `values`."""
+    values = sorted(values)
+    return {f'p{point}': round(values[max(0, -(-len(values) * point // 100) - 1)], 3)
+            for point in points}
+
+
+stats = ProfileStats()
+
+
+class ProfilingMiddleware:
+    """
+    Profile every request: SQL count and time, the view's time outside SQL
+    (reported as serialization), render time and response size.  They're
+    recorded in `stats`, per view, and a query shape repeated
+    `n_plus_one_threshold` times is logged as a likely N+1.
+
+    It's only installed if the PROFILING setting, which defaults to DEBUG, is
+    true.  The timings are sent in a Server-Timing header only in DEBUG or
+    to staff users, as they tell clients how much work a request costs.
+
+    Streamed responses finish after this middleware returns, so only the
+    work done before the first chunk is counted, and their size isn't.
+    """
+    n_plus_one_threshold = 10
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING', settings.DEBUG):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with self.profile(request):
+            response = self.get_response(request)
+        return self.finish(request, response)
+
+    async def __acall__(self, request):
+        # Connections belong to a thread, and the ORM runs queries in the
+        # request's sync_to_async thread, not the event loop's; the execute
+        # wrappers have to be installed on that thread's connections.
+        stack = ExitStack()
+        await sync_to_async(stack.enter_context)(self.profile(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.finish(request, response)
+
+    @contextmanager
+    def profile(self, request):
+        profile = request.profile = RequestProfile()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(profile))
+            yield
+
+    def finish(self, request, response):
+        profile = request.profile
+        metrics = profile.get_metrics(response)
+        user = getattr(request, 'user', None)
+        if settings.DEBUG or (user is not None and user.is_staff):
+            response['Server-Timing'] = self.server_timing(metrics)
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        repeated = profile.repeated_shapes(self.n_plus_one_threshold)
+        for shape, count in repeated.items():
+            logger.warning('Possible N+1 in %s: %d queries like %s', view, count, shape)
+        stats.record(view, metrics, n_plus_one=bool(repeated))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.profile.view_start = time.perf_counter()
+        request.profile.view_sql_time = request.profile.sql_time
+
+    def process_template_response(self, request, response):
+        # Called right before TemplateResponses, like DRF's, are rendered.
+        request.profile.render_start = time.perf_counter()
+        request.profile.render_sql_time = request.profile.sql_time
+        return response
+
+    def server_timing(self, metrics):
+        entries = [f'sql;dur={metrics["sql"]:.1f};desc="{metrics["sql_count"]} queries"']
+        entries.extend(f'{name};dur={metrics[name]:.1f}'
+                       for name in ('serialize', 'render') if name in metrics)
+        entries.append(f'total;dur={metrics["total"]:.1f}')
+        return ', '.join(entries)
+
+
+class ProfilingStatsView(APIView):
+    """Per-view percentiles of the metrics ProfilingMiddleware records."""
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        return Response(stats.summary())
@@ -0,0 +1,54 @@
+import re
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+# A table read from end to end: SQLite's SCAN without an index (virtual
+# tables, like FTS5's, report their own index), or PostgreSQL's Seq Scan.
+FULL_SCAN_RE = re.compile(
+    r'\bSCAN (\w+)\b(?! USING| VIRTUAL TABLE INDEX)|\bSeq Scan on (\w+)')
+# A sort step, which has to read every matching row before the first one
+# is returned.
+SORT_RE = re.compile(r'TEMP B-TREE|\bSort\b')
+
+
+class QueryPlanCommand(BaseCommand):
+    """
+    EXPLAIN the queries get_queries() returns, and fail if any reads a
+    whole table with more than --max-scan-rows rows.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-scan-rows', type=int, default=1000,
+            help='Fail on full scans of tables with more rows than this.',
+        )
+
+    def get_queries(self):
+        """Return (label, sql, params) for each query to check."""
+        raise NotImplementedError
+
+    def explain(self, sql, params):
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+            return '\n'.join(' '.join(str(column) for column in row)
+                             for row in cursor.fetchall())
+
+    def handle(self, *args, max_scan_rows, **options):
+        tables = {model._meta.db_table: model for model in apps.get_models()}
+        failures = []
+        for label, sql, params in self.get_queries():
+            plan = self.explain(sql, params)
+            self.stdout.write(f'{label}:\n{plan}\n')
+            # A LIMITed query reading rows in order stops after one page.
+            if ' LIMIT ' in sql.upper() and not SORT_RE.search(plan):
+                continue
+            for match in FULL_SCAN_RE.finditer(plan):
+                table = match.group(1) or match.group(2)
+                model = tables.get(table)
+                rows = model._default_manager.count() if model else 0
+                if rows > max_scan_rows:
+                    failures.append(f'{label}: full scan of {table} ({rows} rows)')
+        if failures:
+            raise CommandError('\n'.join(failures))
@@ -0,0 +1,178 @@
+import hashlib
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# The table `manage.py sync_replicas` stamps each copy with the time it was
+# taken, in seconds since the epoch.
+HEARTBEAT_TABLE = 'replica_heartbeat'
+
+
+class RoutingState:
+    """What ReplicaRouter knows about the current request."""
+
+    def __init__(self, reading=False, pinned=False):
+        # Whether the request only reads, and whether its client wrote
+        # recently enough that replicas may not have its writes yet.
+        self.reading = reading
+        self.pinned = pinned
+        self.wrote = False
+
+
+routing_state = ContextVar('routing_state', default=None)
+
+
+@contextmanager
+def read_from_primary():
+    """Send the current request's reads to 'default' inside the block."""
+    state = routing_state.get()
+    if state is None:
+        yield
+        return
+    reading, state.reading = state.reading, False
+    try:
+        yield
+    finally:
+        state.reading = reading
+
+
+class ReplicaRouter:
+    """
+    Send the reads of GET, HEAD and OPTIONS requests to one of the
+    DATABASE_REPLICAS that trails the primary by at most REPLICA_MAX_LAG
+    seconds.  Everything else stays on 'default':
+
+    - writes, and reads once the request has written;
+    - reads for clients that wrote in the last READ_YOUR_WRITES_SECONDS
+      (see ReplicaMiddleware);
+    - reads inside a transaction on 'default', which must see its
+      uncommitted rows;
+    - sessions and tokens, since a stale credential logs the client out.
+    """
+    primary_apps = ('sessions', 'authtoken')
+    # How often to measure each replica's lag, in seconds.
+    lag_check_interval = 1
+
+    def __init__(self):
+        self._lags = {}
+
+    def db_for_read(self, model, **hints):
+        state = routing_state.get()
+        if (state is None or not state.reading or state.pinned or state.wrote or
+                model._meta.app_label in self.primary_apps or
+                connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return DEFAULT_DB_ALIAS
+        replicas = [alias for alias in getattr(settings, 'DATABASE_REPLICAS', ())
+                    if self.is_current(alias)]
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Sessions and tokens are always read from the primary, so saving
+        # one, as a plain GET may, doesn't pin the request.
+        state = routing_state.get()
+        if state is not None and model._meta.app_label not in self.primary_apps:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every alias holds the same rows.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+    def is_current(self, alias):
+        lag = self.get_lag(alias)
+        return lag is not None and lag <= getattr(settings, 'REPLICA_MAX_LAG', 10)
+
+    def get_lag(self, alias):
+        """Return how many seconds `alias` trails the primary by, or None if it's down."""
+        now = time.monotonic()
+        checked_at, lag = self._lags.get(alias, (None, None))
+        if checked_at is None or now - checked_at >= self.lag_check_interval:
+            lag = self.measure_lag(alias)
+            self._lags[alias] = (now, lag)
+        return lag
+
+    def measure_lag(self, alias):
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                if HEARTBEAT_TABLE not in connection.introspection.table_names(cursor):
+                    # Not a copy: the primary's own file, opened read-only.
+                    return 0.0
+                cursor.execute(f'SELECT MAX(synced_at) FROM {HEARTBEAT_TABLE}')
+                synced_at, = cursor.fetchone()
+        except DatabaseError:
+            return None
+        return None if synced_at is None else max(0.0, time.time() - synced_at)
+
+
+class ReplicaMiddleware:
+    """
+    Mark the requests whose reads ReplicaRouter may send to a replica, and
+    pin clients that write to the primary for READ_YOUR_WRITES_SECONDS.
+
+    A client is pinned with a cookie, and, since token clients don't keep
+    cookies, in the cache under its Authorization header.  Anonymous
+    clients that don't keep cookies can't be pinned.
+    """
+    cookie_name = 'primary_pin'
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = self.get_state(request)
+        token = routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        return self.finish(request, response, state)
+
+    async def __acall__(self, request):
+        state = self.get_state(request)
+        token = routing_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        return self.finish(request, response, state)
+
+    def get_state(self, request):
+        if request.method not in SAFE_METHODS:
+            return RoutingState()
+        key = self.get_pin_key(request)
+        pinned = self.cookie_name in request.COOKIES or (key is not None and cache.get(key))
+        return RoutingState(reading=True, pinned=bool(pinned))
+
+    def finish(self, request, response, state):
+        if state.wrote:
+            seconds = getattr(settings, 'READ_YOUR_WRITES_SECONDS', 10)
+            response.set_cookie(self.cookie_name, '1', max_age=seconds, httponly=True,
+                                samesite='Lax')
+            key = self.get_pin_key(request)
+            if key is not None:
+                cache.set(key, True, seconds)
+        return response
+
+    def get_pin_key(self, request):
+        authorization = request.META.get('HTTP_AUTHORIZATION')
+        if not authorization:
+            return None
+        return 'primary-pin:' + hashlib.sha256(authorization.encode()).hexdigest()
@@ -10,11 +10,17 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.0/ref/settings/
 """
 
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# The code shared by this repository's projects, in apikit/.
+sys.path.append(str(BASE_DIR.parent))
+
+from apikit.database import sqlite_database  # noqa: E402
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.0/howto/deployment/checklist/
@@ -40,6 +46,7 @@ INSTALLED_APPS = [
     'dj_rest_auth.registration',
     'drf_yasg',
 
+    'apikit',
     'posts',
 ]
 
@@ -53,11 +60,13 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
       'rest_framework.authentication.SessionAuthentication',
-      'rest_framework.authentication.TokenAuthentication',
+      'posts.authentication.CachedTokenAuthentication',
     ],
 }
 
 MIDDLEWARE = [
+    'apikit.profiling.ProfilingMiddleware',
+    'apikit.routers.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -92,9 +101,44 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
 
 DATABASES = {
+    # WAL mode, immediate transactions and persistent connections; see
+    # apikit/database.
+    'default': sqlite_database(BASE_DIR / 'db.sqlite3'),
+    # The same file opened read-only, for the reads of GET requests.
+    'replica': sqlite_database(BASE_DIR / 'db.sqlite3', read_only=True),
+    # A stand-in for a replica server: a copy of the database, refreshed by
+    # `manage.py sync_replicas`.
+    'replica_copy': sqlite_database(BASE_DIR / 'db.replica.sqlite3', read_only=True),
+}
+
+DATABASE_ROUTERS = ['apikit.routers.ReplicaRouter']
+
+# The aliases GET requests read from; see apikit.routers.
+DATABASE_REPLICAS = ['replica', 'replica_copy']
+
+# Replicas further behind the primary than this, in seconds, aren't read.
+REPLICA_MAX_LAG = 10
+
+# How long a client that wrote reads from the primary, in seconds.  At
+# least REPLICA_MAX_LAG, so every replica read afterwards has its writes.
+READ_YOUR_WRITES_SECONDS = 10
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        # Least recently used entries are culled once MAX_ENTRIES is reached.
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogapi',
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
+        # To share cached responses between server processes, use the
+        # file-based cache instead:
+        # 'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        # 'LOCATION': BASE_DIR / 'cache',
     }
 }
 
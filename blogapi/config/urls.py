@@ -18,6 +18,7 @@ from django.urls import include, path
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from apikit.profiling import ProfilingStatsView
 
 schema_view = get_schema_view(openapi.Info(title="Blog API", default_version="v1",
                                            description="A sample API for learning DRF",
@@ -31,6 +32,7 @@ schema_view = get_schema_view(openapi.Info(title="Blog API", default_version="v1
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('profiling/stats/', ProfilingStatsView.as_view(), name='profiling-stats'),
     path('api/v1/', include('posts.urls')),
     path('api-auth/', include('rest_framework.urls')),
     path('api/v1/dj-rest-auth/', include('dj_rest_auth.urls')),
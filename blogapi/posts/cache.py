@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apikit.cache import bump_version
+
+from .models import Post
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def bump_post_version(sender, using, **kwargs):
+    bump_version(sender, using)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def bump_user_version(sender, using, update_fields=None, **kwargs):
+    # Logging in only touches last_login, which no cached response shows.
+    if update_fields == {'last_login'}:
+        return
+    bump_version(sender, using)
@@ -0,0 +1,40 @@
+from django.db import connection
+from django.db.models import Count, Max
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apikit.queryplans import QueryPlanCommand
+from posts.pagination import PostCursorPagination
+from posts.search import search_posts
+from posts.views import PostViewSet
+
+
+class Command(QueryPlanCommand):
+    help = ('EXPLAIN the queries behind the post endpoints, and fail if any reads '
+            'a whole table with more than --max-scan-rows rows.')
+
+    def get_queries(self):
+        """Return (label, sql, params) for each query PostViewSet runs."""
+        posts = PostViewSet.queryset.all()
+        ordering = PostCursorPagination.ordering
+        search_ordering = PostCursorPagination.search_ordering
+        page = PostCursorPagination.page_size
+        querysets = [
+            ('post list', posts.order_by(*ordering)[:page]),
+            ('post list, later page',
+             posts.filter(created_at__lt=timezone.now()).order_by(*ordering)[:page]),
+            ('post list, expand=author',
+             posts.select_related('author').order_by(*ordering)[:page]),
+            ('post list, author filter', posts.filter(author_id=1).order_by(*ordering)[:page]),
+            ('post list, title prefix',
+             posts.filter(title__gte='Dj', title__lt='Dk').order_by('title', 'pk')[:page]),
+            ('post search', search_posts(posts, 'django').order_by(*search_ordering)[:page]),
+            ('post detail', posts.filter(pk=1)),
+            ('bulk update lookup', posts.filter(author_id=1, pk__in=[1, 2])),
+        ]
+        queries = [(label, *queryset.query.sql_with_params())
+                   for label, queryset in querysets]
+        with CaptureQueriesContext(connection) as captured:
+            posts.aggregate(Max(PostViewSet.last_modified_field), Count('pk'))
+        queries.append(('post list validators', captured[0]['sql'], ()))
+        return queries
@@ -0,0 +1,111 @@
+import json
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from rest_framework.authtoken.models import Token
+
+from apikit.loadtest import (
+    Endpoint, format_summary, live_server, load_test_database, run, summarize,
+)
+from posts.models import Post
+from posts.summary import refresh_summaries
+
+PASSWORD = 'loadtest-password'
+WORDS = ('django', 'python', 'cache', 'index', 'query', 'cursor', 'token',
+         'serializer', 'sqlite', 'latency', 'throughput', 'router')
+
+
+class Command(BaseCommand):
+    help = ('Seed a throwaway database, serve the project from a local WSGI server '
+            'and report throughput and latency percentiles for a mix of post, '
+            'user and login requests.  The client runs in the same process, so '
+            'compare results between runs on the same machine.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--json', dest='json_path',
+                            help='Also write the results to this file.')
+
+    def handle(self, *args, users, posts, requests, concurrency, seed, json_path,
+               **options):
+        with load_test_database():
+            self.seed(users, posts, random.Random(seed))
+            endpoints = self.get_endpoints()
+            with live_server() as address:
+                samples, elapsed = run(address, endpoints, requests, concurrency, seed)
+        self.write_summary(summarize(samples, elapsed), json_path)
+
+    def seed(self, users, posts, rng):
+        # Hashing is slow by design, so every user shares one hash.
+        password = make_password(PASSWORD)
+        User = get_user_model()
+        User.objects.bulk_create(
+            (User(username=f'loadtest{n}', password=password) for n in range(users)),
+            batch_size=1000,
+        )
+        user_ids = list(User.objects.values_list('id', flat=True))
+        Token.objects.bulk_create(
+            (Token(key=Token.generate_key(), user_id=pk) for pk in user_ids), batch_size=1000,
+        )
+        Post.objects.bulk_create(
+            (Post(author_id=rng.choice(user_ids), title=self.words(rng, 4),
+                  body=self.words(rng, 60)) for _ in range(posts)),
+            batch_size=1000,
+        )
+        refresh_summaries(user_ids)
+
+    def get_endpoints(self):
+        post_ids = list(Post.objects.values_list('id', flat=True))
+        tokens = list(Token.objects.values_list('user_id', 'key', 'user__username'))
+
+        def list_posts(rng):
+            return 'GET', '/api/v1/', None, {}
+
+        def list_author_posts(rng):
+            author, _, _ = rng.choice(tokens)
+            return 'GET', f'/api/v1/?author={author}&expand=author', None, {}
+
+        def search_posts(rng):
+            return 'GET', f'/api/v1/?search={rng.choice(WORDS)}', None, {}
+
+        def retrieve_post(rng):
+            return 'GET', f'/api/v1/{rng.choice(post_ids)}/', None, {}
+
+        def create_post(rng):
+            author, key, _ = rng.choice(tokens)
+            data = {'author': author, 'title': self.words(rng, 4), 'body': self.words(rng, 60)}
+            return 'POST', '/api/v1/', data, {'Authorization': f'Token {key}'}
+
+        def list_users(rng):
+            _, key, _ = rng.choice(tokens)
+            return 'GET', '/api/v1/users/', None, {'Authorization': f'Token {key}'}
+
+        def login(rng):
+            _, _, username = rng.choice(tokens)
+            data = {'username': username, 'password': PASSWORD}
+            return 'POST', '/api/v1/dj-rest-auth/login/', data, {}
+
+        return [
+            Endpoint('post list', 30, list_posts),
+            Endpoint('post list by author', 10, list_author_posts),
+            Endpoint('post search', 5, search_posts),
+            Endpoint('post detail', 30, retrieve_post),
+            Endpoint('post create', 10, create_post),
+            Endpoint('user list', 10, list_users),
+            Endpoint('login', 5, login),
+        ]
+
+    def words(self, rng, count):
+        return ' '.join(rng.choices(WORDS, k=count))
+
+    def write_summary(self, summary, path):
+        self.stdout.write(format_summary(summary))
+        if path:
+            with open(path, 'w') as f:
+                json.dump(summary, f, indent=2)
@@ -0,0 +1,58 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import posts.models
+
+
+CREATE_SQL = [
+    'CREATE VIRTUAL TABLE posts_post_fts USING fts5(title, body)',
+    'INSERT INTO posts_post_fts (rowid, title, body) SELECT id, title, body FROM posts_post',
+    '''CREATE TRIGGER posts_post_fts_insert AFTER INSERT ON posts_post BEGIN
+        INSERT INTO posts_post_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+    END''',
+    '''CREATE TRIGGER posts_post_fts_update AFTER UPDATE OF title, body ON posts_post BEGIN
+        UPDATE posts_post_fts SET title = new.title, body = new.body WHERE rowid = old.id;
+    END''',
+    '''CREATE TRIGGER posts_post_fts_delete AFTER DELETE ON posts_post BEGIN
+        DELETE FROM posts_post_fts WHERE rowid = old.id;
+    END''',
+]
+
+DROP_SQL = [
+    'DROP TRIGGER posts_post_fts_insert',
+    'DROP TRIGGER posts_post_fts_update',
+    'DROP TRIGGER posts_post_fts_delete',
+    'DROP TABLE posts_post_fts',
+]
+
+
+def run_on_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == 'sqlite':
+            for sql in statements:
+                schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_post_author_updated_at_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSearchIndex',
+            fields=[
+                ('post', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='posts.post')),
+                ('title', models.TextField()),
+                ('body', models.TextField()),
+                ('document', posts.models.SearchDocumentField(db_column='posts_post_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'posts_post_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(run_on_sqlite(CREATE_SQL), run_on_sqlite(DROP_SQL)),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 06:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['title'], name='post_title_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-19 07:13
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_summaries(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    AuthorSummary = apps.get_model('posts', 'AuthorSummary')
+    latest = (Post.objects.filter(author_id=models.OuterRef('author_id'))
+              .order_by('-created_at', '-id'))
+    rows = (Post.objects.order_by().values('author_id')
+            .annotate(post_count=models.Count('pk'), latest_post_at=models.Max('created_at'),
+                      latest_post_id=models.Subquery(latest.values('pk')[:1])))
+    AuthorSummary.objects.bulk_create((AuthorSummary(**row) for row in rows.iterator()),
+                                      batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('posts', '0005_post_title_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorSummary',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='post_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('post_count', models.PositiveIntegerField(default=0)),
+                ('latest_post_at', models.DateTimeField(null=True)),
+                ('latest_post', models.ForeignKey(null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='posts.post')),
+            ],
+        ),
+        migrations.RunPython(build_summaries, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, router, transaction
 from django.contrib.auth.models import User
 
 
@@ -9,5 +9,88 @@ class Post(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='post_created_at_id_idx'),
+            models.Index(fields=['author', '-created_at'], name='post_author_created_at_idx'),
+            # Covers the Max(updated_at) behind the list validators.
+            models.Index(fields=['updated_at'], name='post_updated_at_idx'),
+            models.Index(fields=['title'], name='post_title_idx'),
+        ]
+
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_loaded_author()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.remember_loaded_author()
+
+    def remember_loaded_author(self):
+        # The author as stored, so saving can tell whether the post moved
+        # between AuthorSummary rows without reading it back.
+        if 'author_id' in self.__dict__:
+            self._loaded_author_id = self.author_id
+
+    def save(self, *args, **kwargs):
+        # The author's AuthorSummary is updated by a post_save receiver,
+        # in this transaction, so the post and its summary change together.
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
+
+class AuthorSummary(models.Model):
+    """
+    Each author's post count and latest post, so author listings needn't
+    read posts.  posts.summary keeps it up to date; authors without posts
+    may have no row.
+    """
+    author = models.OneToOneField(User, models.CASCADE, primary_key=True,
+                                  related_name='post_summary')
+    post_count = models.PositiveIntegerField(default=0)
+    # Deleting the latest post finds the next one in the same transaction,
+    # before the foreign key is checked.
+    latest_post = models.ForeignKey(Post, models.DO_NOTHING, null=True, related_name='+')
+    latest_post_at = models.DateTimeField(null=True)
+
+
+class SearchDocumentField(models.TextField):
+    """An FTS5 table's hidden column of the same name, which MATCH searches."""
+
+
+@SearchDocumentField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class PostSearchIndex(models.Model):
+    """
+    The SQLite FTS5 table behind `?search=`.  It's created, and kept in step
+    with Post by triggers, in migration 0004; other databases don't have it.
+
+    SQLite can't alter most columns in place, so migrations that change a
+    Post field rebuild posts_post, which drops the triggers: such migrations
+    have to recreate them.
+    """
+    post = models.OneToOneField(Post, models.DO_NOTHING, primary_key=True,
+                                db_column='rowid', related_name='search_index')
+    title = models.TextField()
+    body = models.TextField()
+    # rank is the bm25 score of a match, lower being better.
+    document = SearchDocumentField(db_column='posts_post_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'posts_post_fts'
@@ -0,0 +1,17 @@
+from rest_framework.pagination import CursorPagination
+
+
+class PostCursorPagination(CursorPagination):
+    # Newest first; id breaks ties between posts created at the same time.
+    # Backed by the (created_at, id) index on Post.
+    ordering = ('-created_at', '-id')
+    search_ordering = ('rank', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        # Search results come most relevant first.
+        if 'rank' in queryset.query.annotations:
+            return self.search_ordering
+        return super().get_ordering(request, queryset, view)
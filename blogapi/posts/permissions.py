@@ -1,4 +1,4 @@
-from rest_framework import permissions
+from rest_framework import filters, permissions
 
 
 class IsAuthorOrReadOnly(permissions.BasePermission):
@@ -6,5 +6,18 @@ class IsAuthorOrReadOnly(permissions.BasePermission):
         # Read-only permissions are allowed for any request
         if request.method in permissions.SAFE_METHODS:
             return True
-        # Write permissions are only allowed to the author of a post
-        return obj.author == request.user
+        # Write permissions are only allowed to the author of a post.
+        # Compare the foreign key column, so the author row is never loaded.
+        return obj.author_id == request.user.pk
+
+
+class IsAuthorFilterBackend(filters.BaseFilterBackend):
+    """
+    The queryset-level counterpart of IsAuthorOrReadOnly, for writes that
+    apply to many posts at once: limits them to the user's own posts in
+    the same query, instead of checking each post.
+    """
+    def filter_queryset(self, request, queryset, view):
+        if request.method in permissions.SAFE_METHODS:
+            return queryset
+        return queryset.filter(author_id=request.user.pk)
@@ -0,0 +1,41 @@
+import re
+
+from django.db import connections
+from django.db.models import F, FloatField, Q, Value
+from rest_framework import filters
+
+
+def fts5_query(text):
+    """Turn user input into an FTS5 query matching every word, as literals."""
+    words = re.findall(r'\w+', text)
+    return ' '.join('"%s"' % word for word in words)
+
+
+def search_posts(queryset, text):
+    """
+    Return the posts in `queryset` matching `text`, annotated with `rank`,
+    lower being more relevant.
+
+    Only SQLite has a full-text index, posts_post_fts; elsewhere this falls
+    back to an unranked substring scan.
+    """
+    if connections[queryset.db].vendor == 'sqlite':
+        query = fts5_query(text)
+        if not query:
+            return queryset.none()
+        return queryset.filter(search_index__document__match=query).annotate(
+            rank=F('search_index__rank'))
+    return queryset.filter(
+        Q(title__icontains=text) | Q(body__icontains=text),
+    ).annotate(rank=Value(0.0, output_field=FloatField()))
+
+
+class FullTextSearchFilter(filters.BaseFilterBackend):
+    """Filter to the posts matching `?search=`, most relevant first."""
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '').strip()
+        if not text:
+            return queryset
+        return search_posts(queryset, text)
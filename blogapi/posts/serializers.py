@@ -1,17 +1,39 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from apikit.mixins import BulkListSerializer, SparseFieldsSerializerMixin
 from .models import Post
 
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
 
     class Meta:
         fields = ('id', 'author', 'title', 'body', 'created_at',)
         model = Post
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    # Annotated by posts.summary.with_post_summary().  Users that were
+    # just created have no posts yet.
+    post_count = serializers.IntegerField(read_only=True, default=0)
+    latest_post = serializers.IntegerField(read_only=True, default=None)
+    latest_post_at = serializers.DateTimeField(read_only=True, default=None)
 
     class Meta:
         model = get_user_model()
-        fields = ('id', 'username',)
+        fields = ('id', 'username', 'post_count', 'latest_post', 'latest_post_at',)
+
+
+class ExpandedPostSerializer(PostSerializer):
+    """PostSerializer with the author embedded, for `?expand=author`."""
+    author = UserSerializer(read_only=True, fields=('id', 'username'))
+
+
+class BulkPostSerializer(PostSerializer):
+    """
+    PostSerializer for bulk writes, which only act on the requesting user's
+    own posts, so the author isn't writable.
+    """
+
+    class Meta(PostSerializer.Meta):
+        read_only_fields = ('author',)
+        list_serializer_class = BulkListSerializer
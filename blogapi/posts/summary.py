@@ -0,0 +1,88 @@
+from django.db import transaction
+from django.db.models import Case, Count, F, Max, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import AuthorSummary, Post
+
+
+def with_post_summary(users):
+    """Annotate users with their post_count, latest_post and latest_post_at."""
+    return users.annotate(
+        post_count=Coalesce('post_summary__post_count', 0),
+        latest_post=F('post_summary__latest_post'),
+        latest_post_at=F('post_summary__latest_post_at'),
+    )
+
+
+def latest_posts():
+    """The posts of the outer query's author, newest first."""
+    return Post.objects.filter(author_id=OuterRef('author_id')).order_by('-created_at', '-id')
+
+
+def refresh_summaries(author_ids):
+    """
+    Rebuild the summaries of `author_ids` from their posts.  Writes that
+    skip Post.save() and delete(), like bulk_create(), must call this.
+    """
+    author_ids = set(author_ids)
+    rows = (Post.objects.filter(author_id__in=author_ids).order_by()
+            .values('author_id')
+            .annotate(post_count=Count('pk'), latest_post_at=Max('created_at'),
+                      latest_post_id=Subquery(latest_posts().values('pk')[:1])))
+    with transaction.atomic():
+        AuthorSummary.objects.filter(author_id__in=author_ids).delete()
+        AuthorSummary.objects.bulk_create(AuthorSummary(**row) for row in rows)
+
+
+@receiver(pre_save, sender=Post)
+def remember_author(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and 'author' not in update_fields:
+        instance._summary_author_id = instance.author_id
+    elif '_loaded_author_id' in instance.__dict__:
+        instance._summary_author_id = instance._loaded_author_id
+    else:
+        # Not loaded from the database, or loaded without its author.
+        instance._summary_author_id = (Post.objects.filter(pk=instance.pk)
+                                       .values_list('author_id', flat=True).first())
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    previous = instance.__dict__.pop('_summary_author_id', None)
+    if update_fields is None or 'author' in update_fields:
+        instance.remember_loaded_author()
+    if not created:
+        # Only a change of author moves a post between summaries; an
+        # unknown previous author is rebuilt from scratch.
+        if previous != instance.author_id:
+            refresh_summaries({previous, instance.author_id} - {None})
+        return
+    newer = Q(latest_post_at__isnull=True) | Q(latest_post_at__lte=instance.created_at)
+    updated = AuthorSummary.objects.filter(author_id=instance.author_id).update(
+        post_count=F('post_count') + 1,
+        latest_post=Case(When(newer, then=Value(instance.pk, output_field=Post._meta.pk)),
+                         default=F('latest_post')),
+        latest_post_at=Case(When(newer, then=Value(instance.created_at)),
+                            default=F('latest_post_at')),
+    )
+    if not updated:
+        refresh_summaries([instance.author_id])
+
+
+@receiver(post_delete, sender=Post)
+def uncount_deleted_post(sender, instance, **kwargs):
+    # Sent inside the deletion's transaction, after the row is gone.
+    is_latest = Q(latest_post_id=instance.pk)
+    AuthorSummary.objects.filter(author_id=instance.author_id).update(
+        post_count=F('post_count') - 1,
+        latest_post=Case(When(is_latest, then=Subquery(latest_posts().values('pk')[:1])),
+                         default=F('latest_post')),
+        latest_post_at=Case(When(is_latest, then=Subquery(latest_posts().values('created_at')[:1])),
+                            default=F('latest_post_at')),
+    )
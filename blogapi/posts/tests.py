@@ -1,6 +1,28 @@
-from django.test import TestCase
+import json
+import sys
+import time
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections, models
+from django.db.models.functions import Lower
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.contrib.auth.models import User
-from .models import Post
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIRequestFactory, APITestCase
+from apikit.cache import get_version
+from apikit.filters import IndexedFilterBackend, check_filter_declarations
+from apikit.profiling import RequestProfile, stats
+from apikit.routers import ReplicaMiddleware, ReplicaRouter, RoutingState, routing_state
+from .authentication import TokenCache, token_cache
+from .models import AuthorSummary, Post
+from .permissions import IsAuthorFilterBackend, IsAuthorOrReadOnly
+from .serializers import PostSerializer
+from .views import AsyncPostList, PostViewSet
 
 
 class BlogTest(TestCase):
@@ -26,3 +48,746 @@ class BlogTest(TestCase):
         self.assertEqual(author, 'testuserNo1')
         self.assertEqual(title, 'Blog title')
         self.assertEqual(body, 'Some content')
+
+
+class PostPaginationTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuserNo1', password='thepass123'
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.user, title=f'Post {i}', body='Some content')
+            for i in range(25)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_first_page(self):
+        response = self.client.get('/api/v1/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_cursor_walks_every_post_once(self):
+        ids = []
+        url = '/api/v1/?page_size=10'
+        while url:
+            response = self.client.get(url)
+            ids.extend(post['id'] for post in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(sorted(ids), sorted(Post.objects.values_list('id', flat=True)))
+        self.assertEqual(len(ids), len(set(ids)))
+
+
+class PostConditionalGetTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuserNo1', password='thepass123'
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, title='Blog title', body='Some content')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_list_not_modified(self):
+        response = self.client.get('/api/v1/')
+        etag = response['ETag']
+        response = self.client.get('/api/v1/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_list_etag_changes_on_write(self):
+        etag = self.client.get('/api/v1/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Post.objects.create(author=self.user, title='Another', body='More')
+        response = self.client.get('/api/v1/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_detail_not_modified(self):
+        url = f'/api/v1/{self.post.pk}/'
+        response = self.client.get(url)
+        self.assertIn('Last-Modified', response)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+
+class PostListCacheTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuserNo1', password='thepass123'
+        )
+        Post.objects.create(author=cls.user, title='Blog title', body='Some content')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cached_list_skips_the_database(self):
+        first = self.client.get('/api/v1/')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/v1/')
+        self.assertEqual(first.data, second.data)
+
+    def test_write_invalidates(self):
+        self.client.get('/api/v1/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Post.objects.create(author=self.user, title='New title', body='More')
+        response = self.client.get('/api/v1/')
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_version_changes_when_the_write_commits(self):
+        version = get_version(Post)
+        with self.captureOnCommitCallbacks(execute=True):
+            Post.objects.create(author=self.user, title='New title', body='More')
+            self.assertEqual(get_version(Post), version)
+        self.assertNotEqual(get_version(Post), version)
+
+    def test_query_params_are_cached_separately(self):
+        self.client.get('/api/v1/')
+        response = self.client.get('/api/v1/?page_size=1')
+        self.assertEqual(len(response.data['results']), 1)
+
+
+class PostExpandAuthorTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(username=f'testuserNo{n}', password='thepass123')
+            for n in range(3)
+        ]
+        for user in cls.users:
+            Post.objects.create(author=user, title='Blog title', body='Some content')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_list_embeds_authors_without_extra_queries(self):
+        # One aggregate for the validators, one query for the page.
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/?expand=author')
+        usernames = {post['author']['username'] for post in response.data['results']}
+        self.assertEqual(usernames, {user.username for user in self.users})
+
+    def test_detail_embeds_author(self):
+        post = Post.objects.first()
+        response = self.client.get(f'/api/v1/{post.pk}/?expand=author')
+        self.assertEqual(response.data['author'],
+                         {'id': post.author_id, 'username': post.author.username})
+
+    def test_author_is_a_pk_by_default(self):
+        response = self.client.get('/api/v1/')
+        self.assertIsInstance(response.data['results'][0]['author'], int)
+
+    def test_rename_invalidates_expanded_list(self):
+        first = self.client.get('/api/v1/?expand=author')
+        user = self.users[0]
+        user.username = 'renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        response = self.client.get('/api/v1/?expand=author',
+                                   HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        usernames = {post['author']['username'] for post in response.data['results']}
+        self.assertIn('renamed', usernames)
+
+
+class PostSparseFieldsTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuserNo1', password='thepass123'
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, title='Blog title', body='Some content')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_list_renders_requested_fields(self):
+        response = self.client.get('/api/v1/?fields=id,title')
+        self.assertEqual(response.data['results'], [{'id': self.post.pk, 'title': 'Blog title'}])
+
+    def test_body_is_not_selected(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/v1/?fields=title')
+        self.assertNotIn('"body"', queries.captured_queries[-1]['sql'])
+
+    def test_detail_renders_requested_fields(self):
+        response = self.client.get(f'/api/v1/{self.post.pk}/?fields=title')
+        self.assertEqual(response.data, {'title': 'Blog title'})
+
+    def test_combines_with_expand(self):
+        response = self.client.get('/api/v1/?fields=title,author&expand=author')
+        self.assertEqual(response.data['results'][0]['author']['username'], 'testuserNo1')
+
+    def test_unknown_field(self):
+        response = self.client.get('/api/v1/?fields=title,password')
+        self.assertEqual(response.status_code, 400)
+        self.client.force_authenticate(self.user)
+        response = self.client.get('/api/v1/users/?fields=password')
+        self.assertEqual(response.status_code, 400)
+
+
+class PostPermissionTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(
+            username='testuserNo1', password='thepass123'
+        )
+        cls.other = User.objects.create_user(
+            username='testuserNo2', password='thepass123'
+        )
+        cls.post = Post.objects.create(
+            author=cls.author, title='Blog title', body='Some content')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_object_permission_does_not_load_author(self):
+        post = Post.objects.get(pk=self.post.pk)
+        request = APIRequestFactory().delete('/')
+        request.user = self.author
+        with self.assertNumQueries(0):
+            self.assertTrue(IsAuthorOrReadOnly().has_object_permission(request, None, post))
+
+    def test_author_delete_queries(self):
+        self.client.force_authenticate(self.author)
+        # Fetch, delete, and update the author's summary.
+        with self.assertNumQueries(3):
+            response = self.client.delete(f'/api/v1/{self.post.pk}/')
+        self.assertEqual(response.status_code, 204)
+
+    def test_author_update_queries(self):
+        self.client.force_authenticate(self.author)
+        # Fetch the post and the author, then save it in a savepoint
+        # without reading its stored author back.
+        with self.assertNumQueries(5):
+            response = self.client.put(f'/api/v1/{self.post.pk}/', {
+                'author': self.author.pk, 'title': 'New title', 'body': 'New content'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_other_user_cannot_delete(self):
+        self.client.force_authenticate(self.other)
+        response = self.client.delete(f'/api/v1/{self.post.pk}/')
+        self.assertEqual(response.status_code, 403)
+
+    def test_filter_backend_limits_writes_to_own_posts(self):
+        Post.objects.create(author=self.other, title='Other', body='Other content')
+        request = APIRequestFactory().patch('/')
+        request.user = self.author
+        queryset = IsAuthorFilterBackend().filter_queryset(request, Post.objects.all(), None)
+        self.assertEqual(list(queryset), [self.post])
+
+
+class UserListTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuserNo1', password='thepass123'
+        )
+
+    def test_list_is_served_from_values(self):
+        self.client.force_authenticate(self.user)
+        with mock.patch.object(User, 'from_db', side_effect=AssertionError):
+            response = self.client.get('/api/v1/users/')
+        self.assertEqual(response.data, [{
+            'id': self.user.pk, 'username': 'testuserNo1',
+            'post_count': 0, 'latest_post': None, 'latest_post_at': None,
+        }])
+
+
+class PostStreamingTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuserNo1', password='thepass123'
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.user, title=f'Post {i}', body='Some content')
+            for i in range(3)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_unpaginated_list_is_streamed(self):
+        view = PostViewSet.as_view({'get': 'list'}, pagination_class=None)
+        response = view(APIRequestFactory().get('/api/v1/?stream=1'))
+        self.assertTrue(response.streaming)
+        expected = PostSerializer(Post.objects.all(), many=True).data
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), expected)
+
+
+class PostBulkTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuserNo1', password='thepass123'
+        )
+        cls.other = User.objects.create_user(
+            username='testuserNo2', password='thepass123'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def bulk_create(self, count):
+        items = [{'title': f'Post {i}', 'body': 'Some content'} for i in range(count)]
+        return self.client.post('/api/v1/bulk/', items, format='json')
+
+    def test_create(self):
+        response = self.bulk_create(3)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([post['title'] for post in response.data], ['Post 0', 'Post 1', 'Post 2'])
+        self.assertEqual(Post.objects.filter(author=self.user).count(), 3)
+
+    def test_create_queries_do_not_grow_with_the_batch(self):
+        with CaptureQueriesContext(connection) as small:
+            self.bulk_create(2)
+        with CaptureQueriesContext(connection) as large:
+            self.bulk_create(50)
+        self.assertEqual(len(small), len(large))
+
+    def test_invalid_item_rejects_the_batch(self):
+        items = [{'title': 'Fine', 'body': 'Some content'}, {'title': 'x' * 51, 'body': ''}]
+        response = self.client.post('/api/v1/bulk/', items, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertEqual(set(response.data[1]), {'title', 'body'})
+        self.assertFalse(Post.objects.exists())
+
+    def test_update(self):
+        posts = self.bulk_create(2).data
+        items = [{'id': post['id'], 'title': 'Changed'} for post in posts]
+        response = self.client.patch('/api/v1/bulk/', items, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(Post.objects.values_list('title', flat=True)), {'Changed'})
+
+    def test_update_is_limited_to_own_posts(self):
+        own = Post.objects.create(author=self.user, title='Mine', body='Some content')
+        other = Post.objects.create(author=self.other, title='Theirs', body='Some content')
+        items = [{'id': own.pk, 'title': 'Changed'}, {'id': other.pk, 'title': 'Changed'}]
+        response = self.client.patch('/api/v1/bulk/', items, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, [{}, {'id': ['Not found.']}])
+        self.assertEqual(Post.objects.get(pk=own.pk).title, 'Mine')
+
+    def test_invalidates_cached_list(self):
+        self.client.get('/api/v1/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bulk_create(1)
+        response = self.client.get('/api/v1/')
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.bulk_create(1).status_code, 403)
+
+
+class CachedTokenAuthenticationTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuserNo1', password='thepass123'
+        )
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_second_request_skips_token_query(self):
+        self.assertEqual(self.client.get('/api/v1/users/').status_code, 200)
+        # Only the user list itself.
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/api/v1/users/').status_code, 200)
+
+    def test_deleted_token_is_rejected(self):
+        self.client.get('/api/v1/users/')
+        self.token.delete()
+        self.assertEqual(self.client.get('/api/v1/users/').status_code, 403)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get('/api/v1/users/')
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/v1/users/').status_code, 403)
+
+    def test_entries_expire(self):
+        self.client.get('/api/v1/users/')
+        with mock.patch('posts.authentication.time.monotonic', return_value=time.monotonic() + 61):
+            with self.assertNumQueries(2):
+                self.client.get('/api/v1/users/')
+
+    def test_lru_is_bounded(self):
+        tokens = TokenCache(maxsize=2, ttl=60)
+        tokens.set('a', 1)
+        tokens.set('b', 2)
+        tokens.get('a')
+        tokens.set('c', 3)
+        self.assertIsNone(tokens.get('b'))
+        self.assertEqual(tokens.get('a'), 1)
+
+
+class CheckQueryPlansTest(TestCase):
+
+    def test_post_queries_use_indexes(self):
+        # Any full scan fails with a threshold of -1 rows.
+        call_command('check_query_plans', max_scan_rows=-1, stdout=StringIO())
+
+
+class PostSearchTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuserNo1', password='thepass123'
+        )
+        cls.tutorial = Post.objects.create(
+            author=cls.user, title='Django tutorial', body='Django views and Django models')
+        cls.recipe = Post.objects.create(
+            author=cls.user, title='Pasta', body='A recipe, written with Django open')
+        Post.objects.create(author=cls.user, title='Other', body='Nothing relevant')
+
+    def setUp(self):
+        cache.clear()
+
+    def search(self, text, **params):
+        return self.client.get('/api/v1/', {'search': text, **params})
+
+    def test_ranked_matches(self):
+        response = self.search('django')
+        self.assertEqual([post['id'] for post in response.data['results']],
+                         [self.tutorial.pk, self.recipe.pk])
+
+    def test_every_word_must_match(self):
+        response = self.search('django pasta')
+        self.assertEqual([post['id'] for post in response.data['results']], [self.recipe.pk])
+
+    def test_index_follows_writes(self):
+        self.recipe.title = 'Spaghetti'
+        self.recipe.body = 'A recipe'
+        self.recipe.save()
+        self.assertEqual(len(self.search('django').data['results']), 1)
+        Post.objects.bulk_create([Post(author=self.user, title='Bulk', body='django')])
+        cache.clear()  # bulk_create() sends no signals to bump the list version.
+        self.assertEqual(len(self.search('django').data['results']), 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tutorial.delete()
+        self.assertEqual(len(self.search('django').data['results']), 1)
+
+    def test_cursor_pagination(self):
+        first = self.search('django', page_size=1)
+        second = self.client.get(first.data['next'])
+        self.assertEqual(second.data['results'][0]['id'], self.recipe.pk)
+        self.assertIsNone(second.data['next'])
+
+    def test_query_syntax_is_literal(self):
+        response = self.search('"django" OR NEAR(')
+        self.assertEqual(response.status_code, 200)
+
+
+class PostFilterTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuserNo1', password='thepass123'
+        )
+        cls.other = User.objects.create_user(
+            username='testuserNo2', password='thepass123'
+        )
+        cls.first = Post.objects.create(author=cls.user, title='Django', body='Some content')
+        cls.second = Post.objects.create(author=cls.other, title='Docker', body='Some content')
+        cls.third = Post.objects.create(author=cls.user, title='Python', body='Some content')
+
+    def setUp(self):
+        cache.clear()
+
+    def ids(self, params):
+        response = self.client.get('/api/v1/', params)
+        self.assertEqual(response.status_code, 200)
+        return [post['id'] for post in response.data['results']]
+
+    def test_author(self):
+        self.assertEqual(set(self.ids({'author': self.user.pk})), {self.first.pk, self.third.pk})
+
+    def test_created_at_range(self):
+        created = Post.objects.get(pk=self.second.pk).created_at
+        self.assertEqual(self.ids({'created_at__gte': created.isoformat(),
+                                   'created_at__lte': created.isoformat()}), [self.second.pk])
+
+    def test_title_prefix(self):
+        self.assertEqual(set(self.ids({'title__prefix': 'D'})), {self.first.pk, self.second.pk})
+        self.assertEqual(self.ids({'title__prefix': 'Dj'}), [self.first.pk])
+
+    def test_ordering(self):
+        self.assertEqual(self.ids({'ordering': 'title'}),
+                         [self.first.pk, self.second.pk, self.third.pk])
+        self.assertEqual(self.ids({'ordering': '-title', 'page_size': 1}), [self.third.pk])
+
+    def test_rejects_unknown_ordering_and_bad_values(self):
+        self.assertEqual(self.client.get('/api/v1/?ordering=body').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/?created_at__gte=soon').status_code, 400)
+
+    def test_title_prefix_at_the_end_of_unicode(self):
+        last = chr(sys.maxunicode)
+        Post.objects.create(author=self.user, title=f'D{last}x', body='Some content')
+        self.assertEqual(len(self.ids({'title__prefix': f'D{last}'})), 1)
+        self.assertEqual(self.ids({'title__prefix': last * 2}), [])
+        self.assertEqual(len(self.ids({'title__prefix': '\ud7ff'})), 0)
+
+    def test_unindexed_fields_cannot_be_declared(self):
+        view = type('View', (PostViewSet,), {'filterset_fields': {'body': ['exact', 'in']}})
+        errors = IndexedFilterBackend().check_declarations(view, Post)
+        self.assertEqual([error.id for error in errors], ['apikit.E001', 'apikit.E002'])
+
+    def test_expression_indexes_are_skipped(self):
+        indexes = [*Post._meta.indexes, models.Index(Lower('title'), name='post_lower_title_idx')]
+        with mock.patch.object(Post._meta, 'indexes', indexes):
+            self.assertEqual(check_filter_declarations(), [])
+
+    def test_routed_views_are_checked(self):
+        self.assertEqual(check_filter_declarations(), [])
+        with mock.patch.object(PostViewSet, 'ordering_fields', ('body',)):
+            self.assertEqual([error.obj for error in check_filter_declarations()], [PostViewSet])
+
+
+@override_settings(PROFILING=True)
+class ProfilingMiddlewareTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuserNo1', password='thepass123'
+        )
+        Post.objects.create(author=cls.user, title='Blog title', body='Some content')
+
+    def setUp(self):
+        cache.clear()
+        stats.clear()
+
+    def test_server_timing_is_sent_to_staff_only(self):
+        self.assertNotIn('Server-Timing', self.client.get('/api/v1/'))
+
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_authenticate(self.user)
+        response = self.client.get('/api/v1/')
+        timings = [entry.split(';')[0] for entry in response['Server-Timing'].split(', ')]
+        self.assertEqual(timings, ['sql', 'serialize', 'render', 'total'])
+
+    def test_stats(self):
+        self.client.get('/api/v1/')
+        self.client.get('/api/v1/')
+        self.assertEqual(self.client.get('/profiling/stats/').status_code, 403)
+
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_authenticate(self.user)
+        summary = self.client.get('/profiling/stats/').data['posts-list']
+        self.assertEqual(summary['requests'], 2)
+        self.assertEqual(summary['n_plus_one'], 0)
+        self.assertEqual(set(summary['metrics']['size']), {'p50', 'p95', 'p99'})
+
+    def test_repeated_shapes(self):
+        profile = RequestProfile()
+        execute = mock.Mock()
+        for pk in range(10):
+            profile(execute, 'SELECT * FROM "posts_post" WHERE "id" = %s', (pk,), False, {})
+        profile(execute, 'SELECT * FROM "auth_user" WHERE "id" IN (%s, %s)', (1, 2), False, {})
+        profile(execute, 'SELECT * FROM "auth_user" WHERE "id" IN (%s)', (3,), False, {})
+        self.assertEqual(profile.sql_count, 12)
+        self.assertEqual(profile.repeated_shapes(10),
+                         {'SELECT * FROM "posts_post" WHERE "id" = %s': 10})
+        self.assertEqual(profile.shapes['SELECT * FROM "auth_user" WHERE "id" IN (...)'], 2)
+
+
+class PostAsyncViewTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuserNo1', password='thepass123'
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.user, title=f'Post {i}', body='Some content')
+            for i in range(5)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_view_is_a_coroutine(self):
+        self.assertTrue(iscoroutinefunction(AsyncPostList.as_view()))
+
+    async def test_list_matches_sync_list(self):
+        query = '?title__prefix=Post&ordering=title&fields=id,title'
+        response = await self.async_client.get(f'/api/v1/async/{query}')
+        self.assertEqual(response.status_code, 200)
+        expected = await sync_to_async(self.client.get)(f'/api/v1/{query}')
+        self.assertEqual(response.json()['results'], expected.json()['results'])
+
+    async def test_detail(self):
+        post = await Post.objects.afirst()
+        response = await self.async_client.get(f'/api/v1/async/{post.pk}/')
+        self.assertEqual(response.json()['author'], self.user.pk)
+        response = await self.async_client.get('/api/v1/async/999/')
+        self.assertEqual(response.status_code, 404)
+
+    async def test_read_only(self):
+        response = await self.async_client.post('/api/v1/async/', {'title': 'x'})
+        self.assertEqual(response.status_code, 405)
+
+    async def test_token_authentication(self):
+        token = await Token.objects.acreate(user=self.user)
+        response = await self.async_client.get(
+            '/api/v1/async/', headers={'Authorization': f'Token {token.key}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.asgi_request.user, self.user)
+
+    async def test_invalid_token_is_rejected(self):
+        # As on the sync list, rather than being read anonymously.
+        response = await self.async_client.get(
+            '/api/v1/async/', headers={'Authorization': 'Token invalid'})
+        self.assertEqual(response.status_code, 403)
+        expected = await sync_to_async(self.client.get)(
+            '/api/v1/', headers={'Authorization': 'Token invalid'})
+        self.assertEqual(response.json(), expected.json())
+
+
+class ReplicaRouterTest(TestCase):
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.router.lag_check_interval = 0
+
+    def route(self, state, model=Post):
+        token = routing_state.set(state)
+        try:
+            # Outside the test's transaction, reads could go to a replica.
+            with mock.patch.object(connections['default'], 'in_atomic_block', False), \
+                    mock.patch.object(ReplicaRouter, 'measure_lag', return_value=0):
+                return self.router.db_for_read(model)
+        finally:
+            routing_state.reset(token)
+
+    def test_list_cache_is_filled_from_primary(self):
+        cache.clear()
+        Post.objects.create(author=User.objects.create_user(username='testuserNo1'),
+                            title='A title', body='Some content')
+        readings = []
+
+        def db_for_read(router, model, **hints):
+            readings.append(routing_state.get().reading)
+            return 'default'
+
+        with mock.patch.object(ReplicaRouter, 'db_for_read', db_for_read):
+            response = self.client.get('/api/v1/')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertTrue(readings)
+        self.assertNotIn(True, readings)
+
+    def test_credentials_stay_on_primary(self):
+        state = RoutingState(reading=True)
+        self.assertIn(self.route(state), ('replica', 'replica_copy'))
+        self.assertEqual(self.route(state, Token), 'default')
+
+    def test_token_client_is_pinned(self):
+        user = User.objects.create_user(username='testuserNo1', password='thepass123')
+        token = Token.objects.create(user=user)
+        auth = f'Token {token.key}'
+        response = self.client.post('/api/v1/', {'author': user.pk, 'title': 't', 'body': 'b'},
+                                    HTTP_AUTHORIZATION=auth)
+        self.assertEqual(response.status_code, 201)
+
+        middleware = ReplicaMiddleware(lambda request: None)
+        factory = RequestFactory()
+        state = middleware.get_state(factory.get('/api/v1/', HTTP_AUTHORIZATION=auth))
+        self.assertTrue(state.pinned)
+        self.assertEqual(self.route(state), 'default')
+        other = middleware.get_state(factory.get('/api/v1/', HTTP_AUTHORIZATION='Token other'))
+        self.assertFalse(other.pinned)
+
+
+class PostSummaryTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuserNo1', password='thepass123'
+        )
+        cls.other = User.objects.create_user(
+            username='testuserNo2', password='thepass123'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def assertSummary(self, user, post_count, latest_post):
+        summary = AuthorSummary.objects.filter(author=user).first()
+        if summary is None:
+            self.assertEqual((post_count, latest_post), (0, None))
+        else:
+            self.assertEqual((summary.post_count, summary.latest_post), (post_count, latest_post))
+
+    def test_create_and_delete(self):
+        first = Post.objects.create(author=self.user, title='First', body='Some content')
+        second = Post.objects.create(author=self.user, title='Second', body='Some content')
+        self.assertSummary(self.user, 2, second)
+        second.delete()
+        self.assertSummary(self.user, 1, first)
+        first.delete()
+        self.assertSummary(self.user, 0, None)
+
+    def test_change_of_author(self):
+        post = Post.objects.create(author=self.user, title='First', body='Some content')
+        post.author = self.other
+        post.save()
+        self.assertSummary(self.user, 0, None)
+        self.assertSummary(self.other, 1, post)
+
+    def test_change_of_author_of_a_loaded_post(self):
+        Post.objects.create(author=self.user, title='First', body='Some content')
+        post = Post.objects.get()
+        post.author = self.other
+        post.save()
+        post.author = self.user
+        post.save()
+        self.assertSummary(self.user, 1, post)
+        self.assertSummary(self.other, 0, None)
+
+    def test_bulk_create(self):
+        self.client.force_authenticate(self.user)
+        items = [{'title': f'Post {i}', 'body': 'Some content'} for i in range(3)]
+        response = self.client.post('/api/v1/bulk/', items, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertSummary(self.user, 3, Post.objects.filter(author=self.user).latest('created_at', 'id'))
+
+    def test_user_list_shows_summary(self):
+        post = Post.objects.create(author=self.user, title='First', body='Some content')
+        self.client.force_authenticate(self.user)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/v1/users/')
+        rows = {row['username']: row for row in response.data}
+        self.assertEqual(rows['testuserNo1']['post_count'], 1)
+        self.assertEqual(rows['testuserNo1']['latest_post'], post.pk)
+        self.assertIsNotNone(rows['testuserNo1']['latest_post_at'])
+        self.assertEqual(rows['testuserNo2']['post_count'], 0)
@@ -1,10 +1,15 @@
 from django.urls import path
 from rest_framework.routers import SimpleRouter
-from .views import UserViewSet, PostViewSet
+from .views import AsyncPostDetail, AsyncPostList, UserViewSet, PostViewSet
 
 
 router = SimpleRouter()
 router.register('users', UserViewSet, basename='users')
 router.register('', PostViewSet, basename='posts')
 
-urlpatterns = router.urls
+urlpatterns = [
+    # The post reads as coroutines, for ASGI deployments.  Ahead of the
+    # router, whose post detail route would match 'async/'.
+    path('async/', AsyncPostList.as_view(), name='posts-async-list'),
+    path('async/<int:pk>/', AsyncPostDetail.as_view(), name='posts-async-detail'),
+] + router.urls
@@ -1,17 +1,131 @@
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from rest_framework import viewsets
 from rest_framework import generics
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from apikit.cache import get_version
+from apikit.filters import IndexedFilterBackend
+from apikit.mixins import (
+    AsyncViewMixin, BulkWriteMixin, CachedListMixin, ConditionalGetMixin, SparseFieldsMixin,
+    StreamingListMixin, ValuesListMixin,
+)
 from .models import Post
-from .permissions import IsAuthorOrReadOnly
-from .serializers import PostSerializer, UserSerializer
+from .pagination import PostCursorPagination
+from .permissions import IsAuthorFilterBackend, IsAuthorOrReadOnly
+from .search import FullTextSearchFilter
+from .serializers import (
+    BulkPostSerializer, ExpandedPostSerializer, PostSerializer, UserSerializer,
+)
+from .summary import refresh_summaries, with_post_summary
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(BulkWriteMixin, CachedListMixin, ConditionalGetMixin,
+                  SparseFieldsMixin, StreamingListMixin, viewsets.ModelViewSet):
+    # Users are included because `?expand=author` responses embed them.
+    cache_models = (Post, get_user_model())
     permission_classes = (IsAuthorOrReadOnly,)
     queryset = Post.objects.all()
     serializer_class = PostSerializer
+    pagination_class = PostCursorPagination
+    filter_backends = (FullTextSearchFilter, IndexedFilterBackend)
+    filterset_fields = {
+        'author': ['exact'],
+        'created_at': ['gt', 'gte', 'lt', 'lte'],
+        'title': ['prefix'],
+    }
+    ordering_fields = ('created_at', 'title', 'id')
+    expanded_columns = ('id', 'title', 'body', 'created_at', 'updated_at',
+                        'author__id', 'author__username')
+    bulk_serializer_class = BulkPostSerializer
+    bulk_filter_backends = (IsAuthorFilterBackend,)
 
+    def expands_author(self):
+        """
+        `?expand=author` embeds each post's author instead of its pk, so
+        clients don't need a request per author.  Reads only.
+        """
+        return (self.request.method in ('GET', 'HEAD') and
+                'author' in self.request.query_params.get('expand', '').split(','))
 
-class UserViewSet(viewsets.ModelViewSet):
+    def get_columns(self):
+        columns = super().get_columns()
+        if not self.expands_author():
+            return columns
+        # Only the columns the expanded serializer reads, on both tables.
+        if columns is None:
+            return list(self.expanded_columns)
+        if 'author' in columns:
+            columns.remove('author')
+            columns.extend(('author__id', 'author__username'))
+        return columns
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.expands_author() and 'author' in (self.get_requested_fields() or ('author',)):
+            queryset = queryset.select_related('author')
+        return queryset
+
+    def get_serializer_class(self):
+        if self.expands_author():
+            return ExpandedPostSerializer
+        return super().get_serializer_class()
+
+    def get_etag(self, request, last_modified, *state):
+        # A post's timestamp doesn't change when its author is renamed.
+        if self.expands_author():
+            state += (get_version(get_user_model()),)
+        return super().get_etag(request, last_modified, *state)
+
+    @action(detail=False, methods=['post', 'patch'], permission_classes=(IsAuthenticated,))
+    def bulk(self, request, *args, **kwargs):
+        if request.method == 'POST':
+            return self.bulk_create(request, *args, **kwargs)
+        return self.bulk_update(request, *args, **kwargs)
+
+    def perform_bulk_create(self, serializer):
+        # bulk_create() sends no signals, so the summary is rebuilt here.
+        with transaction.atomic():
+            serializer.save(author=self.request.user)
+            refresh_summaries([self.request.user.pk])
+
+
+class AsyncPostList(AsyncViewMixin, SparseFieldsMixin, generics.ListAPIView):
+    permission_classes = (IsAuthorOrReadOnly,)
+    queryset = Post.objects.all()
+    serializer_class = PostSerializer
+    pagination_class = PostCursorPagination
+    filter_backends = PostViewSet.filter_backends
+    filterset_fields = PostViewSet.filterset_fields
+    ordering_fields = PostViewSet.ordering_fields
+
+    async def get(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+
+class AsyncPostDetail(AsyncViewMixin, SparseFieldsMixin, generics.RetrieveAPIView):
+    permission_classes = (IsAuthorOrReadOnly,)
+    queryset = Post.objects.all()
+    serializer_class = PostSerializer
+
+    async def get(self, request, *args, **kwargs):
+        return await self.aretrieve(request, *args, **kwargs)
+
+
+class UserViewSet(SparseFieldsMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = get_user_model().objects.all()
     serializer_class = UserSerializer
+    filter_backends = (IndexedFilterBackend,)
+    filterset_fields = {'username': ['exact', 'prefix']}
+    ordering_fields = ('username', 'id')
+    summary_fields = ('post_count', 'latest_post', 'latest_post_at')
+
+    def get_columns(self):
+        # The summary fields are annotations, not columns of the user table.
+        columns = super().get_columns()
+        if columns is None:
+            return None
+        return [column for column in columns if column not in self.summary_fields]
+
+    def get_queryset(self):
+        return with_post_summary(super().get_queryset())
@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from books.models import Book
+from .serializers import BookSerializer
+
+
+class ISBNCache:
+    """
+    The serialized rows of the `maxsize` most recently looked up books,
+    keyed by ISBN, so a repeated lookup is a dict access.
+
+    Rows are read one at a time through the unique index on a miss.  This
+    process's saves and deletes drop the rows they change once they commit;
+    entries also expire after `ttl` seconds, which is how changes made by
+    other processes show up.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.fields = BookSerializer.Meta.fields
+        self._rows = OrderedDict()
+        self._isbns = {}
+        # Bumped by every invalidation, so a row read before one isn't
+        # stored after it.
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, isbn):
+        with self._lock:
+            entry = self._rows.get(isbn)
+            if entry is not None and time.monotonic() - entry[0] <= self.ttl:
+                self._rows.move_to_end(isbn)
+                return entry[2]
+            generation = self._generation
+        row = Book.objects.filter(isbn=isbn).values('pk', *self.fields).first()
+        if row is None:
+            return None
+        pk = row.pop('pk')
+        with self._lock:
+            if generation == self._generation:
+                self._store(pk, row)
+        return row
+
+    def _store(self, pk, row):
+        previous = self._isbns.get(pk)
+        if previous is not None and previous != row['isbn']:
+            self._rows.pop(previous, None)
+        self._rows[row['isbn']] = (time.monotonic(), pk, row)
+        self._rows.move_to_end(row['isbn'])
+        self._isbns[pk] = row['isbn']
+        while len(self._rows) > self.maxsize:
+            _, (_, evicted, _) = self._rows.popitem(last=False)
+            self._isbns.pop(evicted, None)
+
+    def invalidate(self, pk, isbn):
+        """Drop book `pk`'s row, under `isbn` and under the ISBN it was cached with."""
+        with self._lock:
+            self._generation += 1
+            for key in (self._isbns.pop(pk, None), isbn):
+                entry = self._rows.pop(key, None)
+                if entry is not None:
+                    self._isbns.pop(entry[1], None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._rows.clear()
+            self._isbns.clear()
+
+
+isbn_cache = ISBNCache(maxsize=10000, ttl=300)
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_isbn_cache(sender, instance, using, **kwargs):
+    # After the commit, so a lookup racing the write can't store the old
+    # row once it's gone.  Deleting clears instance.pk, so it's read now.
+    pk, isbn = instance.pk, instance.isbn
+    transaction.on_commit(lambda: isbn_cache.invalidate(pk, isbn), using=using)
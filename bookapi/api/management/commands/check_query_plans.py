@@ -0,0 +1,20 @@
+from api.views import BookAPIView
+from apikit.queryplans import QueryPlanCommand
+
+
+class Command(QueryPlanCommand):
+    help = ('EXPLAIN the queries behind the book endpoints, and fail if any reads '
+            'a whole table with more than --max-scan-rows rows.')
+
+    def get_queries(self):
+        """Return (label, sql, params) for each filtered query on books."""
+        # BookAPIView itself is unpaginated and returns every book, so its
+        # query reads the whole table at any size; there's no plan to check.
+        books = BookAPIView.queryset.all()
+        querysets = [
+            ('book by isbn', books.filter(isbn='9781234567897')),
+            ('books by author', books.filter(author='Jane Doe')),
+            ('books by author prefix', books.filter(author__gte='Ja', author__lt='Jb')),
+        ]
+        return [(label, *queryset.query.sql_with_params())
+                for label, queryset in querysets]
@@ -0,0 +1,78 @@
+import json
+import random
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand
+
+from apikit.loadtest import (
+    Endpoint, format_summary, live_server, load_test_database, run, summarize,
+)
+from books.models import Book
+
+WORDS = ('river', 'night', 'garden', 'stone', 'winter', 'house', 'letter',
+         'glass', 'summer', 'road', 'island', 'city')
+AUTHORS = ('William S. Vincent', 'Jane Austen', 'Mary Shelley', 'Ursula K. Le Guin',
+           'Italo Calvino', 'Toni Morrison', 'Jorge Luis Borges', 'Zadie Smith')
+
+
+class Command(BaseCommand):
+    help = ('Seed a throwaway database, serve the project from a local WSGI server '
+            'and report throughput and latency percentiles for a mix of book list '
+            'and ISBN lookup requests.  The client runs in the same process, so '
+            'compare results between runs on the same machine.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--books', type=int, default=2000)
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--json', dest='json_path',
+                            help='Also write the results to this file.')
+
+    def handle(self, *args, books, requests, concurrency, seed, json_path, **options):
+        with load_test_database():
+            self.seed(books, random.Random(seed))
+            endpoints = self.get_endpoints()
+            with live_server() as address:
+                samples, elapsed = run(address, endpoints, requests, concurrency, seed)
+        self.write_summary(summarize(samples, elapsed), json_path)
+
+    def seed(self, books, rng):
+        Book.objects.bulk_create(
+            (Book(title=self.words(rng, 3), subtitle=self.words(rng, 6),
+                  author=rng.choice(AUTHORS), isbn=str(9780000000000 + n))
+             for n in range(books)),
+            batch_size=1000,
+        )
+
+    def get_endpoints(self):
+        isbns = list(Book.objects.values_list('isbn', flat=True))
+
+        def list_books(rng):
+            return 'GET', '/api/', None, {}
+
+        def list_author_books(rng):
+            query = urlencode({'author': rng.choice(AUTHORS), 'fields': 'title,isbn'})
+            return 'GET', f'/api/?{query}', None, {}
+
+        def lookup_isbn(rng):
+            return 'GET', f'/api/isbn/{rng.choice(isbns)}/', None, {}
+
+        def lookup_missing_isbn(rng):
+            return 'GET', '/api/isbn/0000000000000/', None, {}
+
+        return [
+            Endpoint('book list', 10, list_books),
+            Endpoint('book list by author', 20, list_author_books),
+            Endpoint('isbn lookup', 60, lookup_isbn),
+            Endpoint('isbn lookup (missing)', 10, lookup_missing_isbn, expected=(404,)),
+        ]
+
+    def words(self, rng, count):
+        return ' '.join(rng.choices(WORDS, k=count))
+
+    def write_summary(self, summary, path):
+        self.stdout.write(format_summary(summary))
+        if path:
+            with open(path, 'w') as f:
+                json.dump(summary, f, indent=2)
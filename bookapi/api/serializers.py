@@ -1,9 +1,10 @@
 # api/serializers.py
 from rest_framework import serializers
-from bookapi.books.models import Book
+from apikit.mixins import SparseFieldsSerializerMixin
+from books.models import Book
 
 
-class BookSerializer(serializers.ModelSerializer):
+class BookSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Book
         fields = ('title', 'subtitle', 'author', 'isbn')
@@ -1,3 +1,194 @@
+import json
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.core.cache import cache
+from django.db import transaction
 from django.test import TestCase
+from rest_framework.test import APITestCase
+from api.isbn import ISBNCache, isbn_cache
+from books.models import Book
+from .serializers import BookSerializer
+from .views import AsyncBookAPIView
+
+
+def create_books():
+    Book.objects.bulk_create([
+        Book(title='Django for APIs', subtitle='Build web APIs with Python and Django',
+             author='William S. Vincent', isbn='9781735467221'),
+        Book(title='Django for Beginners', subtitle='Build websites with Python and Django',
+             author='William S. Vincent', isbn='9781735467207'),
+        Book(title='Two Scoops of Django', subtitle='Best practices for Django',
+             author='Daniel Feldroy', isbn='9780692915721'),
+    ])
+
+
+class BookListTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_books()
+
+    def setUp(self):
+        cache.clear()
+
+    def get_list(self, query=''):
+        response = self.client.get(f'/api/{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_matches_serializer_without_building_models(self):
+        with mock.patch.object(Book, 'from_db', side_effect=AssertionError):
+            books = self.get_list()
+        self.assertEqual(books, BookSerializer(Book.objects.all(), many=True).data)
+
+    def test_sparse_fields(self):
+        books = self.get_list('?fields=isbn&ordering=isbn')
+        self.assertEqual(books, [{'isbn': isbn} for isbn in
+                                 ('9780692915721', '9781735467207', '9781735467221')])
+
+    def test_unknown_field(self):
+        response = self.client.get('/api/?fields=price')
+        self.assertEqual(response.status_code, 400)
+
+    def test_streamed_on_request(self):
+        response = self.client.get('/api/?stream=1&fields=isbn&ordering=-isbn')
+        self.assertTrue(response.streaming)
+        self.assertEqual(json.loads(b''.join(response.streaming_content))[0],
+                         {'isbn': '9781735467221'})
+
+
+class BookListCacheTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_books()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_second_request_is_cached(self):
+        self.client.get('/api/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/')
+        self.assertEqual(len(response.data), 3)
+
+    def test_write_invalidates(self):
+        self.client.get('/api/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Book.objects.get(isbn='9780692915721').delete()
+        response = self.client.get('/api/')
+        self.assertEqual(len(response.data), 2)
+
+
+class BookFilterTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_books()
+
+    def setUp(self):
+        cache.clear()
+
+    def get_titles(self, query):
+        response = self.client.get(f'/api/{query}')
+        self.assertEqual(response.status_code, 200)
+        return [book['title'] for book in response.json()]
+
+    def test_author(self):
+        self.assertEqual(self.get_titles('?author=Daniel Feldroy'), ['Two Scoops of Django'])
+
+    def test_author_prefix_and_ordering(self):
+        self.assertEqual(self.get_titles('?author__prefix=William&ordering=isbn'),
+                         ['Django for Beginners', 'Django for APIs'])
+
+    def test_unindexed_ordering_is_rejected(self):
+        response = self.client.get('/api/?ordering=title')
+        self.assertEqual(response.status_code, 400)
+
+
+class BookAsyncViewTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_books()
+
+    def test_view_is_a_coroutine(self):
+        self.assertTrue(iscoroutinefunction(AsyncBookAPIView.as_view()))
+
+    async def test_list(self):
+        response = await self.async_client.get('/api/async/?author=Daniel Feldroy&fields=isbn')
+        self.assertEqual(response.json(), [{'isbn': '9780692915721'}])
+
+    async def test_isbn_lookup(self):
+        response = await self.async_client.get('/api/async/isbn/9781735467221/')
+        self.assertEqual(response.json()['title'], 'Django for APIs')
+        response = await self.async_client.get('/api/async/isbn/0000000000000/')
+        self.assertEqual(response.status_code, 404)
+
+
+class BookISBNTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_books()
+
+    def setUp(self):
+        # The views' cache: it's imported from api.isbn, like the views do,
+        # so it's the same object however this module was imported.
+        isbn_cache.clear()
+
+    def test_lookup(self):
+        response = self.client.get('/api/isbn/9781735467221/')
+        self.assertEqual(response.data, BookSerializer(Book.objects.get(isbn='9781735467221')).data)
+        self.assertEqual(self.client.get('/api/isbn/0000000000000/').status_code, 404)
+
+    def test_repeated_lookup_is_cached(self):
+        with self.assertNumQueries(1):
+            self.client.get('/api/isbn/9781735467221/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/isbn/9781735467221/')
+        self.assertEqual(response.data['title'], 'Django for APIs')
+
+    def test_write_drops_row_on_commit(self):
+        isbn_cache.get('9781735467221')
+        book = Book.objects.get(isbn='9781735467221')
+        book.isbn = '9781735467238'
+        with self.captureOnCommitCallbacks(execute=True):
+            book.save()
+        self.assertIsNone(isbn_cache.get('9781735467221'))
+        self.assertEqual(isbn_cache.get('9781735467238')['title'], 'Django for APIs')
+
+    def test_rolled_back_write_is_not_served(self):
+        isbn_cache.get('9781735467221')
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                Book.objects.filter(isbn='9781735467221').update(title='Changed')
+                Book.objects.get(isbn='9781735467221').save()
+                transaction.set_rollback(True)
+        self.assertEqual(isbn_cache.get('9781735467221')['title'], 'Django for APIs')
+
+    def test_row_read_before_a_write_is_not_stored(self):
+        get = Book.objects.filter
+        book = Book.objects.get(isbn='9781735467221')
+
+        def filter_then_write(*args, **kwargs):
+            queryset = get(*args, **kwargs)
+            list(queryset.values('pk'))  # The read happens before the write...
+            isbn_cache.invalidate(book.pk, book.isbn)  # ...which commits now.
+            return queryset
+
+        with mock.patch.object(Book.objects, 'filter', filter_then_write):
+            isbn_cache.get('9781735467221')
+        with self.assertNumQueries(1):
+            isbn_cache.get('9781735467221')
 
-# Create your tests here.
+    def test_least_recently_used_rows_are_evicted(self):
+        small = ISBNCache(maxsize=2, ttl=300)
+        for isbn in ('9781735467221', '9781735467207', '9781735467221', '9780692915721'):
+            small.get(isbn)
+        with self.assertNumQueries(0):
+            small.get('9781735467221')
+            small.get('9780692915721')
+        with self.assertNumQueries(1):
+            small.get('9781735467207')
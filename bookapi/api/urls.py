@@ -1,7 +1,11 @@
 # api/urls.py
 from django.urls import path
-from .views import BookAPIView
+from .views import AsyncBookAPIView, AsyncBookISBNView, BookAPIView, BookISBNView
 
 urlpatterns = [
     path('', BookAPIView.as_view()),
+    path('isbn/<str:isbn>/', BookISBNView.as_view()),
+    # The same reads as coroutines, for ASGI deployments.
+    path('async/', AsyncBookAPIView.as_view()),
+    path('async/isbn/<str:isbn>/', AsyncBookISBNView.as_view()),
 ]
\ No newline at end of file
@@ -1,9 +1,61 @@
 # api/views.py
 from rest_framework import generics
-from bookapi.books.models import Book
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from apikit.filters import IndexedFilterBackend
+from apikit.mixins import (
+    AsyncViewMixin, CachedListMixin, SparseFieldsMixin, StreamingListMixin, ValuesListMixin,
+)
+from books.models import Book
+from .isbn import isbn_cache
 from .serializers import BookSerializer
 
 
-class BookAPIView(generics.ListAPIView):
+class BookAPIView(CachedListMixin, SparseFieldsMixin, StreamingListMixin,
+                  ValuesListMixin, generics.ListAPIView):
+    cache_models = (Book,)
     queryset = Book.objects.all()
     serializer_class = BookSerializer
+    filter_backends = (IndexedFilterBackend,)
+    filterset_fields = {
+        'author': ['exact', 'prefix'],
+        'isbn': ['exact'],
+    }
+    ordering_fields = ('author', 'isbn')
+
+
+class BookISBNView(generics.RetrieveAPIView):
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    lookup_field = 'isbn'
+    # Answer repeated lookups from the in-process ISBN cache.
+    use_isbn_cache = True
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.use_isbn_cache:
+            return super().retrieve(request, *args, **kwargs)
+        row = isbn_cache.get(kwargs[self.lookup_field])
+        if row is None:
+            raise NotFound()
+        return Response(row)
+
+
+class AsyncBookAPIView(AsyncViewMixin, SparseFieldsMixin, generics.ListAPIView):
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    filter_backends = BookAPIView.filter_backends
+    filterset_fields = BookAPIView.filterset_fields
+    ordering_fields = BookAPIView.ordering_fields
+
+    async def get(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+
+class AsyncBookISBNView(AsyncViewMixin, generics.RetrieveAPIView):
+    # Reads the unique index: the ISBN cache reads books synchronously.
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    lookup_field = 'isbn'
+
+    async def get(self, request, *args, **kwargs):
+        return await self.aretrieve(request, *args, **kwargs)
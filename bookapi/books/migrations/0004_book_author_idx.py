@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 06:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0003_book_isbn_unique'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='book',
+            name='author',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+    ]
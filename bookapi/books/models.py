@@ -4,8 +4,8 @@ from django.db import models
 class Book(models.Model):
     title = models.CharField(max_length=250)
     subtitle = models.CharField(max_length=250)
-    author = models.CharField(max_length=100)
-    isbn = models.CharField(max_length=13)
+    author = models.CharField(max_length=100, db_index=True)
+    isbn = models.CharField(max_length=13, unique=True)
 
     def __str__(self):
         return self.title
@@ -10,11 +10,17 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.0/ref/settings/
 """
 
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# The code shared by this repository's projects, in apikit/.
+sys.path.append(str(BASE_DIR.parent))
+
+from apikit.database import sqlite_database  # noqa: E402
+
 
 ALLOWED_HOSTS = []
 
@@ -32,11 +38,14 @@ INSTALLED_APPS = [
     # 3rd party
     'rest_framework',
     # Local
+    'apikit',
     'books.apps.BooksConfig',
     'api.apps.ApiConfig',
 ]
 
 MIDDLEWARE = [
+    'apikit.profiling.ProfilingMiddleware',
+    'apikit.routers.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -71,9 +80,34 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
 
 DATABASES = {
+    # WAL mode, immediate transactions and persistent connections; see
+    # apikit/database.
+    'default': sqlite_database(BASE_DIR / 'db.sqlite3'),
+    # The same file opened read-only, for the reads of GET requests.
+    'replica': sqlite_database(BASE_DIR / 'db.sqlite3', read_only=True),
+}
+
+DATABASE_ROUTERS = ['apikit.routers.ReplicaRouter']
+
+# The aliases GET requests read from; see apikit.routers.
+DATABASE_REPLICAS = ['replica']
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        # Least recently used entries are culled once MAX_ENTRIES is reached.
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'bookapi',
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
+        # To share cached responses between server processes, use the
+        # file-based cache instead:
+        # 'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        # 'LOCATION': BASE_DIR / 'cache',
     }
 }
 
@@ -15,9 +15,11 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from apikit.profiling import ProfilingStatsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('profiling/stats/', ProfilingStatsView.as_view(), name='profiling-stats'),
     path('api/', include('api.urls')),
     path('', include('books.urls')),
 ]
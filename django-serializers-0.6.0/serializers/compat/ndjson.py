@@ -0,0 +1,11 @@
+from serializers import FixtureSerializer
+
+
+class Serializer(FixtureSerializer):
+    def serialize(self, *args, **kwargs):
+        return super(Serializer, self).serialize('ndjson', *args, **kwargs)
+
+    def deserialize(self, *args, **kwargs):
+        return super(Serializer, self).deserialize('ndjson', *args, **kwargs)
+
+Deserializer = Serializer
@@ -8,8 +8,16 @@ from django.db.models.related import RelatedObject
 from django.utils import timezone
 from django.utils.dateparse import parse_date, parse_datetime
 from django.utils.translation import ugettext_lazy as _
-from serializers.utils import is_simple_callable
+from serializers.utils import is_simple_callable, parse_iso_date, parse_iso_datetime
+import re
 import warnings
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+integer_re = re.compile(r'^\s*[+-]?\d+\s*$')
 
 
 class Field(object):
@@ -59,12 +67,139 @@ class Field(object):
         Reverts a simple representation back to the field's value.
         """
         if hasattr(self, 'model_field'):
-            try:
-                return self.model_field.rel.to._meta.get_field(self.model_field.rel.field_name).to_python(value)
-            except:
-                return self.model_field.to_python(value)
+            rel_to_python = self.get_rel_to_python()
+            if rel_to_python is not None:
+                try:
+                    return rel_to_python(value)
+                except Exception:
+                    pass
+            return self.model_field.to_python(value)
         return value
 
+    def get_rel_to_python(self):
+        """
+        Returns the `to_python` of the field a relational model field points
+        at, or None for non-relational fields.  The lookup is only resolved
+        once per model field, rather than once per value.
+        """
+        try:
+            model_field, to_python = self._rel_to_python
+        except AttributeError:
+            model_field = None
+        if model_field is not self.model_field:
+            rel = getattr(self.model_field, 'rel', None)
+            try:
+                to_python = rel.to._meta.get_field(rel.field_name).to_python
+            except Exception:
+                to_python = None
+            self._rel_to_python = (self.model_field, to_python)
+        return to_python
+
+    def convert_native(self, value):
+        """
+        As `from_native`, but returns a `(value, errors)` pair rather than
+        raising `ValidationError`.  `errors` is None if the value is valid.
+
+        Subclasses with typed values override this to validate without
+        using exceptions for control flow, and implement `from_native` in
+        terms of it.
+        """
+        try:
+            return self.from_native(value), None
+        except ValidationError as e:
+            return None, e.messages
+
+    def get_restorer(self, field_name):
+        """
+        Returns a callable `restore(data, into)` that behaves like
+        `field_from_native`, except that it returns any error messages
+        rather than raising.  Returns None if the field is never restored.
+
+        The converters are resolved once, so the restorer can be reused
+        across every row of a batch.
+        """
+        if self.__class__.field_from_native != Field.field_from_native:
+            # Custom restore behaviour, so defer to it for each row.
+            def restore(data, into):
+                try:
+                    self.field_from_native(data, field_name, into)
+                except ValidationError as e:
+                    return e.messages
+            return restore
+
+        if self.readonly:
+            return None
+
+        convert = self.convert_native
+        source = self.source
+        key = source or field_name
+
+        def restore(data, into):
+            if field_name not in data:
+                return None
+            value, errors = convert(data[field_name])
+            if errors:
+                return errors
+            if source == '*':
+                into.update(value)
+            else:
+                into[key] = value
+        return restore
+
+    def convert_column(self, values):
+        """
+        Reverts a column of native values in one pass.  Returns a list of
+        reverted values, and a dict mapping positions in the column to
+        error messages.
+        """
+        convert = self.convert_native
+        column = []
+        errors = {}
+        for pos, value in enumerate(values):
+            value, value_errors = convert(value)
+            if value_errors:
+                errors[pos] = value_errors
+            column.append(value)
+        return column, errors
+
+    def get_column_restorer(self, field_name):
+        """
+        Column-wise equivalent of `get_restorer`.  Returns a callable
+        `restore(batch, into)`, where `into` is a list of dicts parallel to
+        `batch`, that returns a dict mapping row indexes to error messages.
+        """
+        if self.__class__.field_from_native != Field.field_from_native:
+            restore_row = self.get_restorer(field_name)
+
+            def restore(batch, into):
+                errors = {}
+                for index, data in enumerate(batch):
+                    row_errors = restore_row(data, into[index])
+                    if row_errors:
+                        errors[index] = row_errors
+                return errors
+            return restore
+
+        if self.readonly:
+            return None
+
+        source = self.source
+        key = source or field_name
+
+        def restore(batch, into):
+            indexes = [index for (index, data) in enumerate(batch) if field_name in data]
+            column, column_errors = self.convert_column([batch[index][field_name] for index in indexes])
+            errors = {}
+            for pos, index in enumerate(indexes):
+                if pos in column_errors:
+                    errors[index] = column_errors[pos]
+                elif source == '*':
+                    into[index].update(column[pos])
+                else:
+                    into[index][key] = column[pos]
+            return errors
+        return restore
+
     def field_to_native(self, obj, field_name):
         """
         Given and object and a field name, returns the value that should be
@@ -177,6 +312,28 @@ class PrimaryKeyRelatedField(RelatedField):
         else:
             into[field_name + '_id'] = self.from_native(value)
 
+    def get_restorer(self, field_name):
+        convert = self.convert_native
+
+        def restore(data, into):
+            value = data.get(field_name)
+            if hasattr(value, '__iter__'):
+                items, errors = [], []
+                for item in value:
+                    item, item_errors = convert(item)
+                    if item_errors:
+                        errors.extend(item_errors)
+                    items.append(item)
+                if errors:
+                    return errors
+                into[field_name] = items
+            else:
+                value, errors = convert(value)
+                if errors:
+                    return errors
+                into[field_name + '_id'] = value
+        return restore
+
 
 class NaturalKeyRelatedField(RelatedField):
     """
@@ -206,15 +363,21 @@ class BooleanField(Field):
     }
 
     def from_native(self, value):
+        value, errors = self.convert_native(value)
+        if errors:
+            raise ValidationError(errors)
+        return value
+
+    def convert_native(self, value):
         if value in (True, False):
             # if value is 1 or 0 than it's equal to True or False, but we want
             # to return a true bool for semantic reasons.
-            return bool(value)
+            return bool(value), None
         if value in ('t', 'True', '1'):
-            return True
+            return True, None
         if value in ('f', 'False', '0'):
-            return False
-        raise ValidationError(self.error_messages['invalid'] % value)
+            return False, None
+        return None, [self.error_messages['invalid'] % value]
 
 
 class CharField(Field):
@@ -223,6 +386,9 @@ class CharField(Field):
             return value
         return smart_unicode(value)
 
+    def convert_native(self, value):
+        return self.from_native(value), None
+
 
 class DateField(Field):
     error_messages = {
@@ -233,28 +399,49 @@ class DateField(Field):
     }
 
     def from_native(self, value):
+        value, errors = self.convert_native(value)
+        if errors:
+            raise ValidationError(errors)
+        return value
+
+    def convert_native(self, value):
         if value is None:
-            return value
+            return value, None
         if isinstance(value, datetime.datetime):
             if settings.USE_TZ and timezone.is_aware(value):
                 # Convert aware datetimes to the default time zone
                 # before casting them to dates (#17742).
                 default_timezone = timezone.get_default_timezone()
                 value = timezone.make_naive(value, default_timezone)
-            return value.date()
+            return value.date(), None
         if isinstance(value, datetime.date):
-            return value
+            return value, None
+        if not isinstance(value, basestring):
+            return None, [self.error_messages['invalid'] % value]
 
         try:
-            parsed = parse_date(value)
-            if parsed is not None:
-                return parsed
+            parsed = parse_iso_date(value) or parse_date(value)
         except ValueError:
-            msg = self.error_messages['invalid_date'] % value
-            raise ValidationError(msg)
-
-        msg = self.error_messages['invalid'] % value
-        raise ValidationError(msg)
+            return None, [self.error_messages['invalid_date'] % value]
+        if parsed is not None:
+            return parsed, None
+
+        return None, [self.error_messages['invalid'] % value]
+
+    def convert_column(self, values):
+        types = set(map(type, values))
+        if types <= set([datetime.date]):
+            return list(values), {}
+        if types <= set([str, unicode]):
+            # Columns written by `DjangoJSONEncoder` are all fixed width, so
+            # try the fast parser on the whole column first.
+            try:
+                column = [parse_iso_date(value) for value in values]
+            except ValueError:
+                column = None
+            if column is not None and None not in column:
+                return column, {}
+        return super(DateField, self).convert_column(values)
 
 
 class DateTimeField(Field):
@@ -269,10 +456,16 @@ class DateTimeField(Field):
     }
 
     def from_native(self, value):
+        value, errors = self.convert_native(value)
+        if errors:
+            raise ValidationError(errors)
+        return value
+
+    def convert_native(self, value):
         if value is None:
-            return value
+            return value, None
         if isinstance(value, datetime.datetime):
-            return value
+            return value, None
         if isinstance(value, datetime.date):
             value = datetime.datetime(value.year, value.month, value.day)
             if settings.USE_TZ:
@@ -285,26 +478,38 @@ class DateTimeField(Field):
                               RuntimeWarning)
                 default_timezone = timezone.get_default_timezone()
                 value = timezone.make_aware(value, default_timezone)
-            return value
+            return value, None
+        if not isinstance(value, basestring):
+            return None, [self.error_messages['invalid'] % value]
 
         try:
-            parsed = parse_datetime(value)
-            if parsed is not None:
-                return parsed
+            parsed = parse_iso_datetime(value) or parse_datetime(value)
         except ValueError:
-            msg = self.error_messages['invalid_datetime'] % value
-            raise ValidationError(msg)
+            return None, [self.error_messages['invalid_datetime'] % value]
+        if parsed is not None:
+            return parsed, None
 
         try:
             parsed = parse_date(value)
-            if parsed is not None:
-                return datetime.datetime(parsed.year, parsed.month, parsed.day)
         except ValueError:
-            msg = self.error_messages['invalid_date'] % value
-            raise ValidationError(msg)
+            return None, [self.error_messages['invalid_date'] % value]
+        if parsed is not None:
+            return datetime.datetime(parsed.year, parsed.month, parsed.day), None
 
-        msg = self.error_messages['invalid'] % value
-        raise ValidationError(msg)
+        return None, [self.error_messages['invalid'] % value]
+
+    def convert_column(self, values):
+        types = set(map(type, values))
+        if types <= set([datetime.datetime]):
+            return list(values), {}
+        if types <= set([str, unicode]):
+            try:
+                column = [parse_iso_datetime(value) for value in values]
+            except ValueError:
+                column = None
+            if column is not None and None not in column:
+                return column, {}
+        return super(DateTimeField, self).convert_column(values)
 
 
 class IntegerField(Field):
@@ -313,13 +518,39 @@ class IntegerField(Field):
     }
 
     def from_native(self, value):
+        value, errors = self.convert_native(value)
+        if errors:
+            raise ValidationError(errors)
+        return value
+
+    def convert_native(self, value):
         if value in validators.EMPTY_VALUES:
-            return None
+            return None, None
+        if type(value) in (int, long):
+            return value, None
+        if isinstance(value, basestring):
+            if integer_re.match(value):
+                return int(value), None
+            return None, [self.error_messages['invalid']]
         try:
-            value = int(value)
+            return int(value), None
         except (ValueError, TypeError):
-            raise ValidationError(self.error_messages['invalid'])
-        return value
+            return None, [self.error_messages['invalid']]
+
+    def convert_column(self, values):
+        types = set(map(type, values))
+        if types <= set([int, long]):
+            return list(values), {}
+        if types <= set([str, unicode]):
+            # Parse the whole column at once, and only fall back to
+            # converting value by value if any of them are invalid.
+            try:
+                if numpy is not None:
+                    return numpy.array(values).astype(numpy.int64).tolist(), {}
+                return [int(value) for value in values], {}
+            except (ValueError, TypeError, OverflowError):
+                pass
+        return super(IntegerField, self).convert_column(values)
 
 
 class FloatField(Field):
@@ -328,13 +559,33 @@ class FloatField(Field):
     }
 
     def from_native(self, value):
+        value, errors = self.convert_native(value)
+        if errors:
+            raise ValidationError(errors)
+        return value
+
+    def convert_native(self, value):
         if value is None:
-            return value
+            return value, None
+        if type(value) is float:
+            return value, None
         try:
-            return float(value)
+            return float(value), None
         except (TypeError, ValueError):
-            msg = self.error_messages['invalid'] % value
-            raise ValidationError(msg)
+            return None, [self.error_messages['invalid'] % value]
+
+    def convert_column(self, values):
+        types = set(map(type, values))
+        if types <= set([float]):
+            return list(values), {}
+        if types <= set([int, long, str, unicode]):
+            try:
+                if numpy is not None:
+                    return numpy.array(values, dtype=numpy.float64).tolist(), {}
+                return [float(value) for value in values], {}
+            except (ValueError, TypeError, OverflowError):
+                pass
+        return super(FloatField, self).convert_column(values)
 
 # field_mapping = {
 #     models.AutoField: IntegerField,
@@ -6,11 +6,13 @@ from serializers import Field, PrimaryKeyRelatedField, NaturalKeyRelatedField
 from serializers import Serializer
 from serializers.renderers import (
     JSONRenderer,
+    NDJSONRenderer,
     YAMLRenderer,
     DumpDataXMLRenderer
 )
 from serializers.parsers import (
     JSONParser,
+    NDJSONParser,
     DumpDataXMLParser
 )
 from serializers.utils import DictWithMetadata
@@ -64,6 +66,14 @@ class FixtureFields(Serializer):
             ret[model_field.name] = field
         return ret
 
+    def restore_plan_key(self, data):
+        """
+        The fields depend on the parent's model, and on which relations
+        are given as natural keys rather than primary keys.
+        """
+        iterables = [key for key, value in data.items() if hasattr(value, '__iter__')]
+        return (self.parent.model, frozenset(iterables))
+
     def _nk_or_pk_field(self, serialize, data, model_field):
         """
         Determine if natural key field or primary key field should be used.
@@ -93,11 +103,13 @@ class FixtureSerializer(Serializer):
         renderer_classes = {
             'xml': DumpDataXMLRenderer,
             'json': JSONRenderer,
+            'ndjson': NDJSONRenderer,
             'yaml': YAMLRenderer,
         }
         parser_classes = {
             'xml': DumpDataXMLParser,
-            'json': JSONParser
+            'json': JSONParser,
+            'ndjson': NDJSONParser,
         }
 
     def serialize(self, *args, **kwargs):
@@ -129,9 +141,37 @@ class FixtureSerializer(Serializer):
         1. Determine the correct fields for restoring attributes on the model.
         2. Determine the class to use when restoring the model.
         """
-        self.model = models.get_model(*data['model'].split("."))
+        self.model = self.get_model(data)
         return super(FixtureSerializer, self).restore_fields(data)
 
+    def get_model(self, data):
+        """
+        Return the model class named by the row's 'model' key.
+        """
+        return models.get_model(*data['model'].split("."))
+
+    def restore_plan_key(self, data):
+        """
+        Fixtures may contain several models, so keep a separate restore
+        plan for each model.
+        """
+        return self.get_model(data)
+
+    def validate_fields(self, data, plan=None):
+        """
+        As `restore_fields`, determine the model class before validating.
+        """
+        self.model = self.get_model(data)
+        return super(FixtureSerializer, self).validate_fields(data, plan)
+
+    def restore_columns(self, batch):
+        """
+        As `restore_fields`, determine the model class before restoring.
+        The batch is grouped by model, so the first row names it.
+        """
+        self.model = self.get_model(batch[0])
+        return super(FixtureSerializer, self).restore_columns(batch)
+
     def restore_object(self, attrs, instance=None):
         """
         Restore the model instance.
@@ -12,6 +12,25 @@ class JSONParser(object):
             raise DeserializationError(e)
 
 
+class NDJSONParser(object):
+    """
+    Parse newline delimited JSON (JSON Lines), yielding one object per line.
+
+    Lines are parsed lazily as the stream is consumed, and blank lines
+    are ignored.
+    """
+    def parse(self, stream):
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except Exception as e:
+                # Map to deserializer error
+                raise DeserializationError(e)
+
+
 class DumpDataXMLParser(object):
     def parse(self, stream):
         event_stream = pulldom.parse(stream)
@@ -3,7 +3,12 @@ from django.utils import simplejson as json
 from django.utils.encoding import smart_unicode
 from django.utils.html import urlize
 from django.utils.xmlutils import SimplerXMLGenerator
-from serializers.utils import SafeDumper, DictWriter, DjangoJSONEncoder
+from serializers.utils import (
+    SafeDumper,
+    DictWriter,
+    DjangoJSONEncoder,
+    CompactDictWithMetadata,
+)
 try:
     import yaml
 except ImportError:
@@ -30,6 +35,23 @@ class JSONRenderer(BaseRenderer):
                          indent=indent, sort_keys=sort_keys)
 
 
+class NDJSONRenderer(BaseRenderer):
+    """
+    Render a native python object into newline delimited JSON (JSON Lines).
+
+    Each object is written out on its own line as soon as it is converted,
+    so large querysets can be dumped to, or appended to, a stream without
+    holding the complete output in memory.
+    """
+    def render(self, obj, stream, **opts):
+        sort_keys = opts.pop('sort_keys', False)
+        if isinstance(obj, (dict, CompactDictWithMetadata)) or not hasattr(obj, '__iter__'):
+            obj = [obj]
+        for item in obj:
+            json.dump(item, stream, cls=DjangoJSONEncoder, sort_keys=sort_keys)
+            stream.write('\n')
+
+
 class YAMLRenderer(BaseRenderer):
     """
     Render a native python object into YAML.
@@ -49,7 +71,7 @@ class HTMLRenderer(BaseRenderer):
         self._to_html(stream, obj)
 
     def _to_html(self, stream, data):
-        if isinstance(data, dict):
+        if isinstance(data, (dict, CompactDictWithMetadata)):
             stream.write('<table>\n')
             for key, value in data.items():
                 stream.write('<tr><td>%s</td><td>' % key)
@@ -80,7 +102,7 @@ class XMLRenderer(BaseRenderer):
         xml.endDocument()
 
     def _to_xml(self, xml, data):
-        if isinstance(data, dict):
+        if isinstance(data, (dict, CompactDictWithMetadata)):
             xml.startElement('object', {})
             for key, value in data.items():
                 xml.startElement(key, {})
@@ -174,7 +196,7 @@ class DumpDataXMLRenderer(BaseRenderer):
 
 class CSVRenderer(BaseRenderer):
     def render(self, obj, stream, **opts):
-        if isinstance(obj, dict) or not hasattr(obj, '__iter__'):
+        if isinstance(obj, (dict, CompactDictWithMetadata)) or not hasattr(obj, '__iter__'):
             obj = [obj]
         writer = None
         for item in obj:
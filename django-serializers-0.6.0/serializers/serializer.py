@@ -6,6 +6,7 @@ import datetime
 import types
 from serializers.renderers import (
     JSONRenderer,
+    NDJSONRenderer,
     YAMLRenderer,
     XMLRenderer,
     HTMLRenderer,
@@ -13,9 +14,15 @@ from serializers.renderers import (
 )
 from serializers.parsers import (
     JSONParser,
+    NDJSONParser,
 )
 from serializers.fields import *
-from serializers.utils import SortedDictWithMetadata, is_simple_callable
+from serializers.utils import (
+    SortedDictWithMetadata,
+    CompactDictWithMetadata,
+    RowLayout,
+    is_simple_callable,
+)
 from StringIO import StringIO
 from io import BytesIO
 
@@ -68,12 +75,14 @@ class SerializerOptions(object):
         self.renderer_classes = getattr(meta, 'renderer_classes', {
             'xml': XMLRenderer,
             'json': JSONRenderer,
+            'ndjson': NDJSONRenderer,
             'yaml': YAMLRenderer,
             'csv': CSVRenderer,
             'html': HTMLRenderer,
         })
         self.parser_classes = getattr(meta, 'parser_classes', {
-            'json': JSONParser
+            'json': JSONParser,
+            'ndjson': NDJSONParser,
         })
 
 
@@ -106,6 +115,8 @@ class BaseSerializer(Field):
         self.opts = self._options_class(self.Meta, **kwargs)
         self.parent = None
         self.root = None
+        self._layouts = {}
+        self._plans = {}
 
     #####
     # Methods to determine which fields to use when (de)serializing objects.
@@ -169,6 +180,9 @@ class BaseSerializer(Field):
         """
         super(BaseSerializer, self).initialize(parent, model_field)
         self.stack = parent.stack[:]
+        # The parent is resolving a new plan, so drop any nested plans
+        # that were resolved against its previous one.
+        self._plans = {}
         if parent.opts.nested and not isinstance(parent.opts.nested, bool):
             self.opts.nested = parent.opts.nested - 1
         else:
@@ -194,7 +208,7 @@ class BaseSerializer(Field):
             raise RecursionOccured()
         self.stack.append(obj)
 
-        ret = self._dict_class()
+        keys, values, metadata = [], [], []
 
         fields = self.get_fields(serialize=True, obj=obj, nested=self.opts.nested)
         for field_name, field in fields.items():
@@ -204,6 +218,28 @@ class BaseSerializer(Field):
             except RecursionOccured:
                 field = self.get_fields(serialize=True, obj=obj, nested=False)[field_name]
                 value = field.field_to_native(obj, field_name)
+            keys.append(key)
+            values.append(value)
+            metadata.append(field)
+        return self.make_row(keys, values, metadata)
+
+    def make_row(self, keys, values, metadata):
+        """
+        Build the dict-like object representing a single converted object.
+
+        Compact rows share a single layout between every row with the same
+        keys and field types, rather than each row carrying its own copy.
+        """
+        if issubclass(self._dict_class, CompactDictWithMetadata):
+            layout_key = (tuple(keys), tuple([field.__class__ for field in metadata]))
+            try:
+                layout = self._layouts[layout_key]
+            except KeyError:
+                layout = self._layouts[layout_key] = RowLayout(keys, metadata)
+            return self._dict_class(layout, values)
+
+        ret = self._dict_class()
+        for key, value, field in zip(keys, values, metadata):
             ret.set_with_metadata(key, value, field)
         return ret
 
@@ -229,6 +265,123 @@ class BaseSerializer(Field):
             return instance
         return attrs
 
+    #####
+    # Methods for validating and restoring batches of data, collecting all
+    # of the errors rather than stopping at the first one.
+
+    def get_restore_plan(self, data):
+        """
+        Resolve the fields, and their converters, used to restore `data`.
+        Returns a list of `(field_name, restore)` pairs.
+        """
+        fields = self.get_fields(serialize=False, data=data, nested=self.opts.nested)
+        plan = []
+        for field_name, field in fields.items():
+            restore = field.get_restorer(field_name)
+            if restore is not None:
+                plan.append((field_name, restore))
+        return plan
+
+    def restore_plan_key(self, data):
+        """
+        Return a key identifying the restore plan that applies to `data`.
+        Rows with the same key share a single plan within a batch.
+        """
+        return None
+
+    def get_cached_restore_plan(self, data):
+        """
+        Return the restore plan for `data`, resolving it only for the first
+        item with each `restore_plan_key`.
+        """
+        key = self.restore_plan_key(data)
+        try:
+            return self._plans[key]
+        except KeyError:
+            plan = self._plans[key] = self.get_restore_plan(data)
+            return plan
+
+    def validate_fields(self, data, plan=None):
+        """
+        Equivalent to `restore_fields`, except that every field is
+        validated.  Returns an `(attrs, errors)` pair, where `errors` maps
+        field names to lists of error messages.
+        """
+        if plan is None:
+            plan = self.get_restore_plan(data)
+        attrs = {}
+        errors = {}
+        for field_name, restore in plan:
+            field_errors = restore(data, attrs)
+            if field_errors:
+                errors[field_name] = field_errors
+        return attrs, errors
+
+    def validate_batch(self, batch, context=None):
+        """
+        Validate and restore a batch of native dicts.
+
+        Returns a list of `(obj, errors)` pairs, one for each item in the
+        batch.  `obj` is None for any item that has errors.
+        """
+        self.stack = []
+        self.context = context or {}
+        self._plans = {}
+
+        ret = []
+        for data in batch:
+            plan = self.get_cached_restore_plan(data)
+            attrs, errors = self.validate_fields(data, plan)
+            if errors:
+                ret.append((None, errors))
+            else:
+                ret.append((self.restore_object(attrs), errors))
+        return ret
+
+    def restore_columns(self, batch):
+        """
+        Restore a batch of dicts column by column, converting all the
+        values of each field in one pass.  Returns a list of attrs dicts
+        and a parallel list of errors dicts.
+
+        The fields are determined from the first item, so the batch should
+        be homogeneous.
+        """
+        fields = self.get_fields(serialize=False, data=batch[0], nested=self.opts.nested)
+        attrs = [{} for data in batch]
+        errors = [{} for data in batch]
+        for field_name, field in fields.items():
+            restore = field.get_column_restorer(field_name)
+            if restore is None:
+                continue
+            for index, field_errors in restore(batch, attrs).items():
+                errors[index][field_name] = field_errors
+        return attrs, errors
+
+    def validate_columns(self, batch, context=None):
+        """
+        Columnar equivalent of `validate_batch`, for large batches of
+        homogeneous records.  Items are grouped by `restore_plan_key`, and
+        each group is restored with `restore_columns`.
+        """
+        self.stack = []
+        self.context = context or {}
+
+        batch = list(batch)
+        groups = SortedDict()
+        for index, data in enumerate(batch):
+            groups.setdefault(self.restore_plan_key(data), []).append(index)
+
+        ret = [None] * len(batch)
+        for indexes in groups.values():
+            attrs, errors = self.restore_columns([batch[index] for index in indexes])
+            for index, item_attrs, item_errors in zip(indexes, attrs, errors):
+                if item_errors:
+                    ret[index] = (None, item_errors)
+                else:
+                    ret[index] = (self.restore_object(item_attrs), item_errors)
+        return ret
+
     def to_native(self, obj):
         """
         Serialize objects -> primatives.
@@ -256,6 +409,37 @@ class BaseSerializer(Field):
             attrs = self.restore_fields(data)
             return self.restore_object(attrs, instance=getattr(self, 'instance', None))
 
+    def convert_native(self, data):
+        """
+        Validate nested dicts field by field, so that all of their errors
+        are reported.
+        """
+        if not isinstance(data, dict):
+            return super(BaseSerializer, self).convert_native(data)
+        plan = self.get_cached_restore_plan(data)
+        attrs, errors = self.validate_fields(data, plan)
+        if errors:
+            return None, errors
+        return self.restore_object(attrs, instance=getattr(self, 'instance', None)), None
+
+    def convert_column(self, values):
+        """
+        Restore a column of nested dicts column by column as well.
+        """
+        if not values or not all([isinstance(value, dict) for value in values]):
+            return super(BaseSerializer, self).convert_column(values)
+        attrs, errors = self.restore_columns(values)
+        instance = getattr(self, 'instance', None)
+        column = []
+        column_errors = {}
+        for pos, (item_attrs, item_errors) in enumerate(zip(attrs, errors)):
+            if item_errors:
+                column_errors[pos] = item_errors
+                column.append(None)
+            else:
+                column.append(self.restore_object(item_attrs, instance=instance))
+        return column, column_errors
+
     def render(self, data, stream, format, **options):
         """
         Render primatives -> bytestream for serialization.
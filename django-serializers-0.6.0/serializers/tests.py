@@ -1,11 +1,17 @@
 import datetime
 from decimal import Decimal
 from django.core import serializers
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.test import TestCase
 from django.utils.datastructures import SortedDict
+from django.utils.timezone import utc
 from serializers import Serializer, ObjectSerializer, ModelSerializer, FixtureSerializer
 from serializers.fields import Field, NaturalKeyRelatedField, PrimaryKeyRelatedField
+from serializers.fields import BooleanField, DateField, DateTimeField, FloatField, IntegerField
+from serializers.utils import CompactDictWithMetadata, DjangoJSONEncoder
+from serializers.utils import get_fixed_timezone, parse_iso_date, parse_iso_datetime
+from StringIO import StringIO
 
 
 def expand(obj):
@@ -136,6 +142,19 @@ class EncoderTests(SerializationTestCase):
         output = ObjectSerializer().serialize('xml', self.obj)
         self.assertEquals(output, expected)
 
+    def test_ndjson(self):
+        expected = '{"a": 1, "b": "foo", "c": true}\n'
+        output = ObjectSerializer().serialize('ndjson', self.obj)
+        self.assertEquals(output, expected)
+
+    def test_ndjson_one_object_per_line(self):
+        expected = (
+            '{"a": 1, "b": "foo", "c": true}\n'
+            '{"a": 1, "b": "foo", "c": true}\n'
+        )
+        output = ObjectSerializer().serialize('ndjson', [self.obj, ExampleObject()])
+        self.assertEquals(output, expected)
+
 
 class BasicSerializerTests(SerializationTestCase):
     def setUp(self):
@@ -597,12 +616,245 @@ class TestSimpleModel(SerializationTestCase):
         rhs = get_deserialized(RaceEntry.objects.all(), format='xml')
         self.assertTrue(deserialized_eq(lhs, rhs))
 
+    def test_modelserializer_deserialize_ndjson(self):
+        lhs = get_deserialized(RaceEntry.objects.all(), format='ndjson', serializer=self.serializer)
+        rhs = get_deserialized(RaceEntry.objects.all())
+        self.assertTrue(deserialized_eq(lhs, rhs))
+
+    def test_dumpdata_deserialize_ndjson(self):
+        lhs = get_deserialized(RaceEntry.objects.all(), format='ndjson', serializer=self.dumpdata)
+        rhs = get_deserialized(RaceEntry.objects.all())
+        self.assertTrue(deserialized_eq(lhs, rhs))
+
+    def test_ndjson_append(self):
+        """
+        NDJSON output can be appended to an existing export.
+        """
+        stream = StringIO()
+        self.dumpdata.serialize('ndjson', RaceEntry.objects.all(), stream=stream)
+        self.dumpdata.serialize('ndjson', RaceEntry.objects.all(), stream=stream)
+        objects = list(self.dumpdata.deserialize('ndjson', stream.getvalue()))
+        self.assertEqual(len(objects), 2)
+
     # def test_xml_parsing(self):
     #     data = self.dumpdata.serialize('xml', RaceEntry.objects.all())
     #     object = list(self.dumpdata.deserialize('xml', data))[0].object
     #     print repr((object.name, object.runner_number, object.start_time, object.finish_time))
 
 
+class CompactRaceEntrySerializer(ModelSerializer):
+    _dict_class = CompactDictWithMetadata
+
+    class Meta:
+        model = RaceEntry
+
+
+class TestCompactRows(SerializationTestCase):
+    def setUp(self):
+        self.serializer = CompactRaceEntrySerializer()
+        for runner_number in (6014, 6015):
+            RaceEntry.objects.create(
+                name='John doe',
+                runner_number=runner_number,
+                start_time=datetime.datetime(year=2012, month=4, day=30, hour=9),
+                finish_time=datetime.datetime(year=2012, month=4, day=30, hour=12, minute=25)
+            )
+
+    def test_rows_share_layout(self):
+        rows = list(self.serializer.serialize('python', RaceEntry.objects.all()))
+        self.assertTrue(rows[0].layout is rows[1].layout)
+        self.assertEquals(rows[0].keys(), ['id', 'name', 'runner_number', 'start_time', 'finish_time'])
+        self.assertEquals(rows[1]['runner_number'], 6015)
+
+    def test_items_with_metadata(self):
+        row = list(self.serializer.serialize('python', RaceEntry.objects.all()))[0]
+        for key, value, field in row.items_with_metadata():
+            self.assertEquals(row[key], value)
+            self.assertTrue(isinstance(field, Field))
+
+    def test_json(self):
+        self.assertEquals(
+            self.serializer.serialize('json', RaceEntry.objects.all()),
+            RaceEntrySerializer().serialize('json', RaceEntry.objects.all())
+        )
+
+    def test_csv(self):
+        self.assertEquals(
+            self.serializer.serialize('csv', RaceEntry.objects.all()),
+            RaceEntrySerializer().serialize('csv', RaceEntry.objects.all())
+        )
+
+    def test_modelserializer_deserialize(self):
+        lhs = get_deserialized(RaceEntry.objects.all(), serializer=self.serializer)
+        rhs = get_deserialized(RaceEntry.objects.all())
+        self.assertTrue(deserialized_eq(lhs, rhs))
+
+
+class EntrySerializer(Serializer):
+    runner_number = IntegerField()
+    finished = BooleanField()
+    start_time = DateTimeField()
+
+
+class TestBatchValidation(SerializationTestCase):
+    def test_valid_batch(self):
+        batch = [
+            {'runner_number': '6014', 'finished': 'True', 'start_time': '2012-04-30 09:00:00'},
+            {'runner_number': 6015, 'finished': False, 'start_time': '2012-04-30'},
+        ]
+        expected = [
+            ({'runner_number': 6014, 'finished': True, 'start_time': datetime.datetime(2012, 4, 30, 9, 0)}, {}),
+            ({'runner_number': 6015, 'finished': False, 'start_time': datetime.datetime(2012, 4, 30, 0, 0)}, {}),
+        ]
+        self.assertEquals(EntrySerializer().validate_batch(batch), expected)
+
+    def test_all_errors_are_collected(self):
+        """
+        Every invalid field in every row is reported, not just the first.
+        """
+        batch = [
+            {'runner_number': 'abc', 'finished': 'maybe', 'start_time': '2012-04-30 09:00:00'},
+            {'runner_number': 6015, 'finished': True, 'start_time': 'noon'},
+        ]
+        results = EntrySerializer().validate_batch(batch)
+        self.assertEquals(results[0][0], None)
+        self.assertEquals(sorted(results[0][1].keys()), ['finished', 'runner_number'])
+        self.assertEquals(results[1][0], None)
+        self.assertEquals(results[1][1].keys(), ['start_time'])
+
+    def test_from_native_still_raises(self):
+        self.assertRaises(ValidationError, IntegerField().from_native, 'abc')
+        self.assertRaises(ValidationError, BooleanField().from_native, 'maybe')
+
+    def test_modelserializer_batch(self):
+        batch = [{
+            'id': 1,
+            'name': 'John doe',
+            'runner_number': 6014,
+            'start_time': '2012-04-30T09:00:00',
+            'finish_time': '2012-04-30T12:25:00'
+        }]
+        obj, errors = RaceEntrySerializer().validate_batch(batch)[0]
+        self.assertEquals(errors, {})
+        self.assertEquals(obj.object.runner_number, 6014)
+        self.assertEquals(obj.object.finish_time, datetime.datetime(2012, 4, 30, 12, 25))
+
+    def test_dumpdata_batch(self):
+        RaceEntry.objects.create(
+            name='John doe',
+            runner_number=6014,
+            start_time=datetime.datetime(year=2012, month=4, day=30, hour=9),
+            finish_time=datetime.datetime(year=2012, month=4, day=30, hour=12, minute=25)
+        )
+        dumpdata = FixtureSerializer()
+        batch = list(dumpdata.serialize('python', RaceEntry.objects.all()))
+        batch[0]['fields']['runner_number'] = 'abc'
+        results = dumpdata.validate_batch(batch)
+        self.assertEquals(results[0][0], None)
+        self.assertEquals(results[0][1]['fields'].keys(), ['runner_number'])
+
+    def test_dumpdata_batch_reuses_nested_plan(self):
+        for runner_number in (6014, 6015):
+            RaceEntry.objects.create(
+                name='John doe',
+                runner_number=runner_number,
+                start_time=datetime.datetime(year=2012, month=4, day=30, hour=9),
+                finish_time=datetime.datetime(year=2012, month=4, day=30, hour=12, minute=25)
+            )
+        dumpdata = FixtureSerializer()
+        batch = list(dumpdata.serialize('python', RaceEntry.objects.all()))
+        results = dumpdata.validate_batch(batch)
+        self.assertEquals([obj.object.runner_number for (obj, errors) in results], [6014, 6015])
+        self.assertEquals(len(dumpdata.fields['fields']._plans), 1)
+
+
+class TestColumnarValidation(SerializationTestCase):
+    def test_matches_row_by_row_validation(self):
+        batch = [
+            {'runner_number': '6014', 'finished': 'True', 'start_time': '2012-04-30 09:00:00'},
+            {'runner_number': 'abc', 'finished': 'maybe', 'start_time': '2012-04-30 09:00:00'},
+            {'runner_number': 6015, 'finished': True, 'start_time': 'noon'},
+        ]
+        self.assertEquals(
+            EntrySerializer().validate_columns(batch),
+            EntrySerializer().validate_batch(batch)
+        )
+
+    def test_integer_column(self):
+        column, errors = IntegerField().convert_column(['1', '2', '3'])
+        self.assertEquals(column, [1, 2, 3])
+        self.assertEquals(errors, {})
+
+    def test_integer_column_with_errors(self):
+        column, errors = IntegerField().convert_column(['1', '', 'x'])
+        self.assertEquals(column, [1, None, None])
+        self.assertEquals(errors.keys(), [2])
+
+    def test_float_column(self):
+        column, errors = FloatField().convert_column(['1.5', 2, '3e2'])
+        self.assertEquals(column, [1.5, 2.0, 300.0])
+        self.assertEquals(errors, {})
+
+    def test_date_column(self):
+        column, errors = DateField().convert_column(['2012-04-30', '2012-05-01'])
+        self.assertEquals(column, [datetime.date(2012, 4, 30), datetime.date(2012, 5, 1)])
+        self.assertEquals(errors, {})
+
+    def test_datetime_column_with_errors(self):
+        column, errors = DateTimeField().convert_column(['2012-04-30T09:00:00', '2012-04-30 09:30', 'noon'])
+        self.assertEquals(column, [datetime.datetime(2012, 4, 30, 9, 0), datetime.datetime(2012, 4, 30, 9, 30), None])
+        self.assertEquals(errors.keys(), [2])
+
+    def test_dumpdata_columns(self):
+        for runner_number in (6014, 6015):
+            RaceEntry.objects.create(
+                name='John doe',
+                runner_number=runner_number,
+                start_time=datetime.datetime(year=2012, month=4, day=30, hour=9),
+                finish_time=datetime.datetime(year=2012, month=4, day=30, hour=12, minute=25)
+            )
+        dumpdata = FixtureSerializer()
+        batch = list(dumpdata.serialize('python', RaceEntry.objects.all()))
+        self.assertEquals(
+            [obj.object.runner_number for (obj, errors) in dumpdata.validate_columns(batch)],
+            [6014, 6015]
+        )
+
+
+class TestISOParsing(SerializationTestCase):
+    def test_encoder_output_roundtrip(self):
+        encoder = DjangoJSONEncoder()
+        for value in (
+            datetime.datetime(2012, 4, 30, 9, 0),
+            datetime.datetime(2012, 4, 30, 9, 0, 11, 345000),
+            datetime.datetime(2012, 4, 30, 9, 0, tzinfo=utc),
+            datetime.datetime(2012, 4, 30, 9, 0, tzinfo=get_fixed_timezone(-330)),
+        ):
+            self.assertEquals(parse_iso_datetime(encoder.default(value)), value)
+
+    def test_date(self):
+        self.assertEquals(parse_iso_date('2012-04-30'), datetime.date(2012, 4, 30))
+
+    def test_irregular_formats_are_not_parsed(self):
+        self.assertEquals(parse_iso_datetime('2012-04-30 09:00:00'), None)
+        self.assertEquals(parse_iso_datetime('2012-04-30T09:00'), None)
+        self.assertEquals(parse_iso_datetime('2012-04-30T09:00:00+0200'), None)
+        self.assertEquals(parse_iso_date('2012-4-30'), None)
+
+    def test_timezones_are_reused(self):
+        self.assertTrue(
+            parse_iso_datetime('2012-04-30T09:00:00+02:00').tzinfo is
+            parse_iso_datetime('2012-05-01T10:00:00+02:00').tzinfo
+        )
+
+    def test_fields_fall_back_to_general_parser(self):
+        self.assertEquals(
+            DateTimeField().from_native('2012-04-30 09:00:00'),
+            datetime.datetime(2012, 4, 30, 9, 0)
+        )
+        self.assertRaises(ValidationError, DateTimeField().from_native, '2012-02-30T09:00:00')
+
+
 class TestNullPKModel(SerializationTestCase):
     def setUp(self):
         self.dumpdata = FixtureSerializer()
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from django.utils.datastructures import SortedDict
-from django.utils.timezone import is_aware
+from django.utils.timezone import is_aware, utc
+from django.utils.tzinfo import FixedOffset
 
 import csv
 import datetime
@@ -41,6 +42,105 @@ class SortedDictWithMetadata(SortedDict, DictWithMetadata):
     pass
 
 
+class RowLayout(object):
+    """
+    The ordered keys and field metadata shared by every row of one shape.
+    """
+    __slots__ = ('keys', 'fields', 'index')
+
+    def __init__(self, keys, fields):
+        self.keys = tuple(keys)
+        self.fields = tuple(fields)
+        self.index = dict((key, pos) for (pos, key) in enumerate(self.keys))
+
+    def extend(self, key, field=None):
+        return RowLayout(self.keys + (key,), self.fields + (field,))
+
+
+class CompactDictWithMetadata(object):
+    """
+    A compact, ordered, dict-like row with metadata attached.
+
+    The keys and metadata are held by a `RowLayout` shared between all the
+    rows of the same shape, so each row only stores its list of values.
+    """
+    __slots__ = ('layout', 'row')
+
+    def __init__(self, layout, values):
+        self.layout = layout
+        self.row = list(values)
+
+    def __getitem__(self, key):
+        return self.row[self.layout.index[key]]
+
+    def __setitem__(self, key, value):
+        pos = self.layout.index.get(key)
+        if pos is None:
+            # Copy-on-write, so that other rows sharing the layout are unaffected.
+            self.layout = self.layout.extend(key)
+            self.row.append(value)
+        else:
+            self.row[pos] = value
+
+    def __contains__(self, key):
+        return key in self.layout.index
+
+    def __iter__(self):
+        return iter(self.layout.keys)
+
+    def __len__(self):
+        return len(self.row)
+
+    def __eq__(self, other):
+        if isinstance(other, CompactDictWithMetadata):
+            other = dict(other.items())
+        return dict(self.items()) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return '{%s}' % ', '.join(['%r: %r' % item for item in self.items()])
+
+    def get(self, key, default=None):
+        pos = self.layout.index.get(key)
+        if pos is None:
+            return default
+        return self.row[pos]
+
+    def keys(self):
+        return list(self.layout.keys)
+
+    def values(self):
+        return list(self.row)
+
+    def items(self):
+        return zip(self.layout.keys, self.row)
+
+    iterkeys = __iter__
+
+    def itervalues(self):
+        return iter(self.row)
+
+    def iteritems(self):
+        return iter(self.items())
+
+    @property
+    def metadata(self):
+        return dict(zip(self.layout.keys, self.layout.fields))
+
+    def set_with_metadata(self, key, value, metadata):
+        pos = self.layout.index.get(key)
+        if pos is None:
+            self.layout = self.layout.extend(key, metadata)
+            self.row.append(value)
+        else:
+            self.row[pos] = value
+
+    def items_with_metadata(self):
+        return zip(self.layout.keys, self.row, self.layout.fields)
+
+
 try:
     import yaml
 except ImportError:
@@ -85,6 +185,8 @@ else:
             yaml.representer.SafeRepresenter.represent_dict)
     SafeDumper.add_representer(SortedDictWithMetadata,
             yaml.representer.SafeRepresenter.represent_dict)
+    SafeDumper.add_representer(CompactDictWithMetadata,
+            yaml.representer.SafeRepresenter.represent_dict)
     SafeDumper.add_representer(types.GeneratorType,
             yaml.representer.SafeRepresenter.represent_list)
 
@@ -113,11 +215,91 @@ class DjangoJSONEncoder(json.JSONEncoder):
             return r
         elif isinstance(o, decimal.Decimal):
             return str(o)
+        elif isinstance(o, CompactDictWithMetadata):
+            return SortedDict(o.items())
         elif hasattr(o, '__iter__'):
             return [i for i in o]
         return super(DjangoJSONEncoder, self).default(o)
 
 
+_timezones = {0: utc}
+
+
+def get_fixed_timezone(offset):
+    """
+    Return a tzinfo for an offset from UTC in minutes, reusing a single
+    instance for each offset.
+    """
+    try:
+        return _timezones[offset]
+    except KeyError:
+        return _timezones.setdefault(offset, FixedOffset(offset))
+
+
+def parse_iso_date(value):
+    """
+    Fast parser for the fixed width 'YYYY-MM-DD' dates that
+    `DjangoJSONEncoder` emits.
+
+    Returns None if the value is in any other format, so that the caller
+    can fall back to the general purpose parser.  Raises ValueError if the
+    value is well formatted, but not a valid date.
+    """
+    if len(value) != 10 or value[4] != '-' or value[7] != '-':
+        return None
+    year, month, day = value[:4], value[5:7], value[8:]
+    if not (year + month + day).isdigit():
+        return None
+    return datetime.date(int(year), int(month), int(day))
+
+
+def parse_iso_datetime(value):
+    """
+    Fast parser for the fixed width ISO 8601 datetimes that
+    `DjangoJSONEncoder` emits, 'YYYY-MM-DDTHH:MM:SS[.mmm[uuu]]', followed
+    by an optional 'Z' or '+HH:MM' offset.
+
+    Returns None if the value is in any other format, so that the caller
+    can fall back to the general purpose parser.  Raises ValueError if the
+    value is well formatted, but not a valid datetime.
+    """
+    if (len(value) < 19 or value[4] != '-' or value[7] != '-' or
+        value[10] != 'T' or value[13] != ':' or value[16] != ':'):
+        return None
+    digits = value[:4] + value[5:7] + value[8:10] + value[11:13] + value[14:16] + value[17:19]
+    if not digits.isdigit():
+        return None
+
+    rest = value[19:]
+    microsecond = 0
+    if rest[:1] == '.':
+        if rest[1:7].isdigit() and len(rest) >= 7:
+            microsecond = int(rest[1:7])
+            rest = rest[7:]
+        elif rest[1:4].isdigit():
+            microsecond = int(rest[1:4]) * 1000
+            rest = rest[4:]
+        else:
+            return None
+
+    if not rest:
+        tzinfo = None
+    elif rest == 'Z':
+        tzinfo = utc
+    elif (len(rest) == 6 and rest[0] in '+-' and rest[3] == ':' and
+          (rest[1:3] + rest[4:]).isdigit()):
+        offset = int(rest[1:3]) * 60 + int(rest[4:])
+        if rest[0] == '-':
+            offset = -offset
+        tzinfo = get_fixed_timezone(offset)
+    else:
+        return None
+
+    return datetime.datetime(int(digits[:4]), int(digits[4:6]), int(digits[6:8]),
+                             int(digits[8:10]), int(digits[10:12]), int(digits[12:]),
+                             microsecond, tzinfo)
+
+
 class DictWriter(csv.DictWriter):
     """
     >>> from cStringIO import StringIO
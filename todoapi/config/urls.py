@@ -15,8 +15,10 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import include, path
+from apikit.profiling import ProfilingStatsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('profiling/stats/', ProfilingStatsView.as_view(), name='profiling-stats'),
     path('api/', include('todos.urls')),
 ]
@@ -4,18 +4,23 @@ import axios from 'axios';
 
 class App extends Component {
     state = {
-        todos: []
+        todos: [],
+        next: null
     };
 
 componentDidMount() {
-    this.getTodos();
+    this.getTodos('http://127.0.0.1:8000/api/');
 }
 
-getTodos() {
+// The API returns one page at a time, with a cursor link to the next page.
+getTodos(url) {
     axios
-        .get('http://127.0.0.1:8000/api/')
+        .get(url)
         .then(res => {
-            this.setState({ todos: res.data });
+            this.setState(state => ({
+                todos: state.todos.concat(res.data.results),
+                next: res.data.next
+            }));
         })
     .catch(err => {
         console.log(err);
@@ -31,9 +36,14 @@ getTodos() {
                         <span>{item.body}</span>
                     </div>
                 ))}
+                {this.state.next && (
+                    <button onClick={() => this.getTodos(this.state.next)}>
+                        Load more
+                    </button>
+                )}
             </div>
         );
     }
 }
 
-export default App;
\ No newline at end of file
+export default App;
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apikit.cache import bump_version
+
+from .models import Todo
+
+
+@receiver(post_save, sender=Todo)
+@receiver(post_delete, sender=Todo)
+def bump_todo_version(sender, using, **kwargs):
+    bump_version(sender, using)
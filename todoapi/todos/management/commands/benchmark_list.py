@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework import generics
+from rest_framework.test import APIRequestFactory
+
+from apikit.mixins import ValuesListMixin
+from todos.models import Todo
+from todos.serializers import TodoSerializer
+
+
+class UnpaginatedListTodo(ValuesListMixin, generics.ListAPIView):
+    queryset = Todo.objects.order_by('id')
+    serializer_class = TodoSerializer
+    pagination_class = None
+
+
+class Command(BaseCommand):
+    help = ('Time the todo list with the model serializer and with the '
+            'values_list() fast path.  The rows are rolled back afterwards.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, rows, repeat, **options):
+        with transaction.atomic():
+            Todo.objects.bulk_create(
+                (Todo(title=f'todo {i}', body='a body here') for i in range(rows)),
+                batch_size=1000,
+            )
+            factory = APIRequestFactory()
+            for label, use_values_list in (('serializer', False), ('values_list', True)):
+                view = UnpaginatedListTodo.as_view(use_values_list=use_values_list)
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    view(factory.get('/api/')).render()
+                    timings.append(time.perf_counter() - start)
+                self.stdout.write(f'{label}: best of {repeat}: {min(timings) * 1000:.0f} ms')
+            transaction.set_rollback(True)
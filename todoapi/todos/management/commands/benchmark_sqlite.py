@@ -0,0 +1,116 @@
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+from apikit.database import sqlite_database
+
+ROWS = 10000
+
+
+class Command(BaseCommand):
+    help = ('Run concurrent readers and writers against a scratch SQLite file, '
+            "first with Django's stock SQLite settings, then with "
+            'apikit.database.sqlite_database(), and report the throughput of each.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--seconds', type=float, default=5)
+
+    def handle(self, *args, readers, writers, seconds, **options):
+        self.stdout.write('setup   reads/s  writes/s  read errors  write errors')
+        for label, get_databases in (('stock', self.stock_databases),
+                                     ('tuned', self.tuned_databases)):
+            with tempfile.TemporaryDirectory() as directory:
+                databases = get_databases(os.path.join(directory, 'benchmark.sqlite3'))
+                with self.aliases(databases):
+                    self.create_table('benchmark_write')
+                    counts = self.run(readers, writers, seconds)
+            self.stdout.write(
+                f'{label:<6}  {counts["reads"] / seconds:>7.0f}  '
+                f'{counts["writes"] / seconds:>8.0f}  '
+                f'{counts["read_errors"]:>11}  {counts["write_errors"]:>12}'
+            )
+
+    def stock_databases(self, name):
+        return {
+            'benchmark_write': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': name},
+            'benchmark_read': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': name},
+        }
+
+    def tuned_databases(self, name):
+        return {
+            'benchmark_write': sqlite_database(name),
+            'benchmark_read': sqlite_database(name, read_only=True),
+        }
+
+    @contextmanager
+    def aliases(self, databases):
+        """Add `databases` to the project's connections for the duration of a run."""
+        configured = connections.configure_settings({**connections.settings, **databases})
+        connections.settings.update({alias: configured[alias] for alias in databases})
+        try:
+            yield
+        finally:
+            for alias in databases:
+                connections[alias].close()
+                del connections[alias]
+                del connections.settings[alias]
+
+    def create_table(self, alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute('CREATE TABLE item (id INTEGER PRIMARY KEY, title TEXT, hits INTEGER)')
+            with transaction.atomic(using=alias):
+                cursor.executemany('INSERT INTO item (title, hits) VALUES (%s, 0)',
+                                   [(f'item {n}',) for n in range(ROWS)])
+
+    def run(self, readers, writers, seconds):
+        counts = {'reads': 0, 'writes': 0, 'read_errors': 0, 'write_errors': 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + seconds
+
+        def read():
+            # A page of the list, newest first.
+            with connections['benchmark_read'].cursor() as cursor:
+                cursor.execute('SELECT id, title, hits FROM item WHERE id <= %s '
+                               'ORDER BY id DESC LIMIT 20', [random.randint(20, ROWS)])
+                cursor.fetchall()
+
+        def write():
+            # Read, then write, in one transaction, like bulk_update().
+            with transaction.atomic(using='benchmark_write'):
+                with connections['benchmark_write'].cursor() as cursor:
+                    pk = random.randint(1, ROWS)
+                    cursor.execute('SELECT hits FROM item WHERE id = %s', [pk])
+                    hits, = cursor.fetchone()
+                    cursor.execute('UPDATE item SET hits = %s WHERE id = %s', [hits + 1, pk])
+
+        def worker(operation, done, failed):
+            try:
+                while time.perf_counter() < deadline:
+                    try:
+                        operation()
+                        key = done
+                    except OperationalError:
+                        key = failed
+                    with lock:
+                        counts[key] += 1
+            finally:
+                connections['benchmark_read'].close()
+                connections['benchmark_write'].close()
+
+        threads = [threading.Thread(target=worker, args=(read, 'reads', 'read_errors'))
+                   for _ in range(readers)]
+        threads += [threading.Thread(target=worker, args=(write, 'writes', 'write_errors'))
+                    for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return counts
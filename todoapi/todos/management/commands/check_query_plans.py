@@ -0,0 +1,31 @@
+from django.db import connection
+from django.db.models import Count, Max
+from django.test.utils import CaptureQueriesContext
+
+from apikit.queryplans import QueryPlanCommand
+from todos.pagination import TodoCursorPagination
+from todos.views import DetailTodo, ListTodo
+
+
+class Command(QueryPlanCommand):
+    help = ('EXPLAIN the queries behind the todo endpoints, and fail if any reads '
+            'a whole table with more than --max-scan-rows rows.')
+
+    def get_queries(self):
+        """Return (label, sql, params) for each query ListTodo and DetailTodo run."""
+        todos = ListTodo.queryset.all()
+        ordering = TodoCursorPagination.ordering
+        page = TodoCursorPagination.page_size
+        querysets = [
+            ('todo list', todos.order_by(*ordering)[:page]),
+            ('todo list, later page', todos.filter(id__gt=1).order_by(*ordering)[:page]),
+            ('todo list, title prefix',
+             todos.filter(title__gte='Bu', title__lt='Bv').order_by(*ordering)[:page]),
+            ('todo detail', DetailTodo.queryset.filter(pk=1)),
+        ]
+        queries = [(label, *queryset.query.sql_with_params())
+                   for label, queryset in querysets]
+        with CaptureQueriesContext(connection) as captured:
+            todos.aggregate(Max(ListTodo.last_modified_field), Count('pk'))
+        queries.append(('todo list validators', captured[0]['sql'], ()))
+        return queries
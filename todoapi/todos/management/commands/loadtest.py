@@ -0,0 +1,89 @@
+import base64
+import json
+import random
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from apikit.loadtest import (
+    Endpoint, format_summary, live_server, load_test_database, run, summarize,
+)
+from todos.models import Todo
+
+USERNAME = 'loadtest'
+PASSWORD = 'loadtest-password'
+WORDS = ('buy', 'milk', 'call', 'mum', 'fix', 'bike', 'read', 'book',
+         'walk', 'dog', 'pay', 'rent')
+
+
+class Command(BaseCommand):
+    help = ('Seed a throwaway database, serve the project from a local WSGI server '
+            'and report throughput and latency percentiles for a mix of todo list, '
+            'detail and bulk write requests.  The client runs in the same process, '
+            'so compare results between runs on the same machine.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--todos', type=int, default=10000)
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--json', dest='json_path',
+                            help='Also write the results to this file.')
+
+    def handle(self, *args, todos, requests, concurrency, seed, json_path, **options):
+        # Bulk writes use basic authentication, which checks the password on
+        # every request; a fast hasher keeps that out of the measurements.
+        with load_test_database(), override_settings(
+                PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']):
+            self.seed(todos, random.Random(seed))
+            endpoints = self.get_endpoints()
+            with live_server() as address:
+                samples, elapsed = run(address, endpoints, requests, concurrency, seed)
+        self.write_summary(summarize(samples, elapsed), json_path)
+
+    def seed(self, todos, rng):
+        get_user_model().objects.create_user(username=USERNAME, password=PASSWORD)
+        Todo.objects.bulk_create(
+            (Todo(title=self.words(rng, 3), body=self.words(rng, 20)) for _ in range(todos)),
+            batch_size=1000,
+        )
+
+    def get_endpoints(self):
+        todo_ids = list(Todo.objects.values_list('id', flat=True))
+        credentials = base64.b64encode(f'{USERNAME}:{PASSWORD}'.encode()).decode()
+        auth = {'Authorization': f'Basic {credentials}'}
+
+        def list_todos(rng):
+            return 'GET', '/api/', None, {}
+
+        def list_todo_titles(rng):
+            return 'GET', f'/api/?title__prefix={rng.choice(WORDS)}&fields=id,title', None, {}
+
+        def retrieve_todo(rng):
+            return 'GET', f'/api/{rng.choice(todo_ids)}/', None, {}
+
+        def create_todos(rng):
+            data = [{'title': self.words(rng, 3), 'body': self.words(rng, 20)} for _ in range(10)]
+            return 'POST', '/api/bulk/', data, auth
+
+        def update_todos(rng):
+            data = [{'id': pk, 'body': self.words(rng, 20)} for pk in rng.sample(todo_ids, 10)]
+            return 'PATCH', '/api/bulk/', data, auth
+
+        return [
+            Endpoint('todo list', 35, list_todos),
+            Endpoint('todo list by title', 15, list_todo_titles),
+            Endpoint('todo detail', 35, retrieve_todo),
+            Endpoint('todo bulk create', 10, create_todos),
+            Endpoint('todo bulk update', 5, update_todos),
+        ]
+
+    def words(self, rng, count):
+        return ' '.join(rng.choices(WORDS, k=count))
+
+    def write_summary(self, summary, path):
+        self.stdout.write(format_summary(summary))
+        if path:
+            with open(path, 'w') as f:
+                json.dump(summary, f, indent=2)
@@ -2,8 +2,10 @@ from django.db import models
 
 
 class Todo(models.Model):
-    title = models.CharField(max_length=200)
+    title = models.CharField(max_length=200, db_index=True)
     body = models.TextField()
+    # Indexed for the Max(updated_at) behind the list validators.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.title
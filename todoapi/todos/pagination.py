@@ -0,0 +1,9 @@
+from rest_framework.pagination import CursorPagination
+
+
+class TodoCursorPagination(CursorPagination):
+    # Keyed on the primary key, so every page is an index range scan.
+    ordering = ('id',)
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
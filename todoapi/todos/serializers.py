@@ -1,9 +1,11 @@
 from rest_framework import serializers
+from apikit.mixins import BulkListSerializer, SparseFieldsSerializerMixin
 from .models import Todo
 
 
-class TodoSerializer(serializers.ModelSerializer):
+class TodoSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Todo
         fields = ('id', 'title', 'body',)
+        list_serializer_class = BulkListSerializer
         
\ No newline at end of file
@@ -1,5 +1,27 @@
-from django.test import TestCase
+import json
+import random
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import RequestFactory, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIRequestFactory, APITestCase
+from apikit.loadtest import live_server, run, summarize
+from apikit.profiling import ProfilingMiddleware, stats
+from apikit.routers import (
+    ReplicaMiddleware, ReplicaRouter, RoutingState, read_from_primary, routing_state,
+)
+from .management.commands.loadtest import Command as LoadTestCommand
 from .models import Todo
+from .serializers import TodoSerializer
+from .views import AsyncListTodo, ListTodo
 
 class TodoModelTest(TestCase):
 
@@ -17,4 +39,403 @@ class TodoModelTest(TestCase):
         todo = Todo.objects.get(id=1)
 
         expected_object_name = f'{todo.body}'
-        self.assertEqual(expected_object_name, 'a body here')
\ No newline at end of file
+        self.assertEqual(expected_object_name, 'a body here')
+
+
+class TodoPaginationTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Todo.objects.bulk_create(
+            Todo(title=f'todo {i}', body='a body here') for i in range(25)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_pages_follow_id_order(self):
+        first = self.client.get('/api/')
+        self.assertEqual(len(first.data['results']), 20)
+        second = self.client.get(first.data['next'])
+        self.assertEqual(len(second.data['results']), 5)
+        self.assertIsNone(second.data['next'])
+        ids = [todo['id'] for todo in first.data['results'] + second.data['results']]
+        self.assertEqual(ids, sorted(ids))
+
+
+class TodoConditionalGetTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.todo = Todo.objects.create(title='first todoapi', body='a body here')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_list_not_modified(self):
+        etag = self.client.get('/api/')['ETag']
+        response = self.client.get('/api/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_detail_modified_after_save(self):
+        url = f'/api/{self.todo.pk}/'
+        etag = self.client.get(url)['ETag']
+        self.todo.title = 'changed'
+        self.todo.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['title'], 'changed')
+
+
+class TodoListCacheTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.todo = Todo.objects.create(title='first todoapi', body='a body here')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cached_list_skips_the_database(self):
+        self.client.get('/api/')
+        with self.assertNumQueries(0):
+            self.client.get('/api/')
+
+    def test_delete_invalidates(self):
+        self.client.get('/api/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.todo.delete()
+        response = self.client.get('/api/')
+        self.assertEqual(response.data['results'], [])
+
+
+class TodoSparseFieldsTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.todo = Todo.objects.create(title='first todoapi', body='a body here')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_list_skips_body(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/?fields=id,title')
+        self.assertEqual(response.data['results'], [{'id': self.todo.pk, 'title': 'first todoapi'}])
+        self.assertNotIn('"body"', queries.captured_queries[-1]['sql'])
+
+    def test_detail(self):
+        response = self.client.get(f'/api/{self.todo.pk}/?fields=body')
+        self.assertEqual(response.data, {'body': 'a body here'})
+
+    def test_unknown_field(self):
+        response = self.client.get('/api/?fields=owner')
+        self.assertEqual(response.status_code, 400)
+
+
+class TodoValuesListTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Todo.objects.bulk_create(
+            Todo(title=f'todo {i}', body='a body here') for i in range(25)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_matches_serializer_without_building_models(self):
+        with mock.patch.object(Todo, 'from_db', side_effect=AssertionError):
+            response = self.client.get('/api/?page_size=100')
+        expected = TodoSerializer(Todo.objects.order_by('id'), many=True).data
+        self.assertEqual(response.data['results'], expected)
+
+    def test_cursor_pagination(self):
+        first = self.client.get('/api/?fields=title')
+        second = self.client.get(first.data['next'])
+        self.assertEqual(len(first.data['results']), 20)
+        self.assertEqual(second.data['results'][0], {'title': 'todo 20'})
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_list', rows=10, repeat=1, stdout=out)
+        labels = [line.split(':')[0] for line in out.getvalue().splitlines()]
+        self.assertEqual(labels, ['serializer', 'values_list'])
+        # Its rows are rolled back.
+        self.assertEqual(Todo.objects.count(), 25)
+
+
+class TodoStreamingTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Todo.objects.bulk_create(
+            Todo(title=f'todo {i}', body='a body here') for i in range(5)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def get_unpaginated(self, path, chunk_size=2):
+        view = ListTodo.as_view(pagination_class=None, stream_chunk_size=chunk_size)
+        return view(APIRequestFactory().get(path))
+
+    def test_unpaginated_list_is_streamed(self):
+        response = self.get_unpaginated('/api/?stream=1')
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content)
+        expected = TodoSerializer(Todo.objects.all(), many=True).data
+        self.assertEqual(json.loads(content), expected)
+
+    def test_streams_sparse_fields(self):
+        response = self.get_unpaginated('/api/?fields=title&stream=1')
+        titles = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(titles[0], {'title': 'todo 0'})
+        self.assertEqual(len(titles), 5)
+
+    def test_streaming_is_opt_in(self):
+        response = self.get_unpaginated('/api/')
+        self.assertFalse(response.streaming)
+        self.assertEqual(len(response.data), 5)
+
+    def test_paginated_list_is_not_streamed(self):
+        self.assertFalse(self.client.get('/api/?stream=1').streaming)
+
+
+class TodoBulkTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='thepass123')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def test_anonymous_cannot_write(self):
+        self.client.force_authenticate(None)
+        items = [{'title': 'todo', 'body': 'a body here'}]
+        response = self.client.post('/api/bulk/', items, format='json')
+        self.assertEqual(response.status_code, 403)
+        response = self.client.patch('/api/bulk/', [], format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Todo.objects.exists())
+
+    def test_create(self):
+        items = [{'title': f'todo {i}', 'body': 'a body here'} for i in range(3)]
+        response = self.client.post('/api/bulk/', items, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([todo['id'] for todo in response.data],
+                         list(Todo.objects.order_by('id').values_list('id', flat=True)))
+
+    def test_update(self):
+        todos = Todo.objects.bulk_create(
+            Todo(title=f'todo {i}', body='a body here') for i in range(3)
+        )
+        before = Todo.objects.get(pk=todos[0].pk).updated_at
+        items = [{'id': todo.pk, 'body': 'done'} for todo in todos]
+        response = self.client.patch('/api/bulk/', items, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(Todo.objects.values_list('body', flat=True)), {'done'})
+        self.assertGreater(Todo.objects.get(pk=todos[0].pk).updated_at, before)
+
+    def test_update_unknown_ids(self):
+        todo = Todo.objects.create(title='first todoapi', body='a body here')
+        items = [{'id': todo.pk, 'body': 'done'}, {'id': 'nope'}, {'body': 'done'}]
+        response = self.client.patch('/api/bulk/', items, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, [{}, {'id': ['Not found.']}, {'id': ['Not found.']}])
+
+    def test_not_a_list(self):
+        response = self.client.post('/api/bulk/', {'title': 'x', 'body': 'y'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class CheckQueryPlansTest(TestCase):
+
+    def test_todo_queries_use_indexes(self):
+        # Any full scan fails with a threshold of -1 rows.
+        call_command('check_query_plans', max_scan_rows=-1, stdout=StringIO())
+
+
+class TodoFilterTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Todo.objects.bulk_create(
+            Todo(title=title, body='a body here') for title in ('Buy milk', 'Build shed', 'Call mum')
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_title_prefix(self):
+        response = self.client.get('/api/?title__prefix=Bu')
+        self.assertEqual([todo['title'] for todo in response.data['results']],
+                         ['Buy milk', 'Build shed'])
+
+    def test_ordering_with_sparse_fields(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/?ordering=-title&fields=id&page_size=2')
+        second = self.client.get(response.data['next'])
+        ids = [todo['id'] for todo in response.data['results'] + second.data['results']]
+        self.assertEqual(ids, list(Todo.objects.order_by('-title').values_list('id', flat=True)))
+
+
+@override_settings(PROFILING=True)
+class ProfilingMiddlewareTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Todo.objects.bulk_create(Todo(title=f'todo {i}', body='a body here') for i in range(3))
+
+    def setUp(self):
+        cache.clear()
+        stats.clear()
+
+    def test_server_timing(self):
+        with self.settings(DEBUG=True):
+            response = self.client.get('/api/')
+        timings = [entry.split(';')[0] for entry in response['Server-Timing'].split(', ')]
+        self.assertEqual(timings, ['sql', 'serialize', 'render', 'total'])
+
+    def test_off_unless_enabled(self):
+        with self.settings(PROFILING=False):
+            self.assertRaises(MiddlewareNotUsed, ProfilingMiddleware, lambda request: None)
+
+    def test_n_plus_one_is_flagged(self):
+        def n_plus_one(*args, **kwargs):
+            for todo in Todo.objects.all():
+                Todo.objects.get(pk=todo.pk)
+            return original(*args, **kwargs)
+
+        original = ListTodo.list
+        with mock.patch.object(ProfilingMiddleware, 'n_plus_one_threshold', 3), \
+                mock.patch.object(ListTodo, 'list', n_plus_one), \
+                self.assertLogs('apikit.profiling', 'WARNING'):
+            self.client.get('/api/')
+        self.assertEqual(stats.summary()['todos.views.ListTodo']['n_plus_one'], 1)
+
+    @override_settings(PROFILING=True)
+    async def test_async_view_queries_are_counted(self):
+        await self.async_client.get('/api/async/')
+        sql_count = stats.summary()['todos.views.AsyncListTodo']['metrics']['sql_count']
+        self.assertGreater(sql_count['p50'], 0)
+
+
+class LoadTestTest(TransactionTestCase):
+    databases = '__all__'
+
+    # The project's own hosts, not a test settings wildcard, so the server
+    # has to allow the address its clients connect to.
+    @override_settings(ALLOWED_HOSTS=[])
+    def test_requests_succeed(self):
+        command = LoadTestCommand()
+        command.seed(20, random.Random(0))
+        with live_server() as address:
+            samples, elapsed = run(address, command.get_endpoints(), requests=20, concurrency=1)
+        summary = summarize(samples, elapsed)
+        self.assertEqual(summary['all']['requests'], 20)
+        self.assertEqual(summary['all']['errors'], 0)
+
+
+class TodoAsyncViewTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Todo.objects.bulk_create(Todo(title=f'todo {i}', body='a body here') for i in range(3))
+
+    def setUp(self):
+        cache.clear()
+
+    def test_view_is_a_coroutine(self):
+        self.assertTrue(iscoroutinefunction(AsyncListTodo.as_view()))
+
+    async def test_list_matches_sync_list(self):
+        query = '?title__prefix=todo&fields=id,title&page_size=2'
+        response = await self.async_client.get(f'/api/async/{query}')
+        self.assertEqual(response.status_code, 200)
+        expected = await sync_to_async(self.client.get)(f'/api/{query}')
+        self.assertEqual(response.json()['results'], expected.json()['results'])
+
+    async def test_detail(self):
+        todo = await Todo.objects.afirst()
+        response = await self.async_client.get(f'/api/async/{todo.pk}/')
+        self.assertEqual(response.json(), {'id': todo.pk, 'title': todo.title, 'body': todo.body})
+        response = await self.async_client.get('/api/async/999/')
+        self.assertEqual(response.status_code, 404)
+
+
+class ReplicaRouterTest(TestCase):
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.router.lag_check_interval = 0
+
+    def route(self, state, lags=None):
+        lags = lags or {'replica': 0, 'replica_copy': 0}
+        token = routing_state.set(state)
+        try:
+            # Outside the test's transaction, reads could go to a replica.
+            with mock.patch.object(connections['default'], 'in_atomic_block', False), \
+                    mock.patch.object(ReplicaRouter, 'measure_lag', side_effect=lags.get):
+                return self.router.db_for_read(Todo)
+        finally:
+            routing_state.reset(token)
+
+    def test_reads(self):
+        self.assertIn(self.route(RoutingState(reading=True)), ('replica', 'replica_copy'))
+        self.assertEqual(self.route(RoutingState(reading=False)), 'default')
+        self.assertEqual(self.route(None), 'default')
+
+    def test_read_from_primary(self):
+        state = RoutingState(reading=True)
+        token = routing_state.set(state)
+        try:
+            with read_from_primary():
+                self.assertEqual(self.route(state), 'default')
+        finally:
+            routing_state.reset(token)
+        self.assertIn(self.route(state), ('replica', 'replica_copy'))
+
+    def test_lagging_replicas_are_skipped(self):
+        lags = {'replica': 0, 'replica_copy': 60}
+        self.assertEqual(self.route(RoutingState(reading=True), lags), 'replica')
+        lags = {'replica': None, 'replica_copy': 60}
+        self.assertEqual(self.route(RoutingState(reading=True), lags), 'default')
+
+    def test_reads_after_a_write(self):
+        state = RoutingState(reading=True)
+        token = routing_state.set(state)
+        try:
+            self.assertEqual(self.router.db_for_write(Todo), 'default')
+        finally:
+            routing_state.reset(token)
+        self.assertTrue(state.wrote)
+        self.assertEqual(self.route(state), 'default')
+
+    def test_session_writes_do_not_pin(self):
+        state = RoutingState(reading=True)
+        token = routing_state.set(state)
+        try:
+            self.router.db_for_write(Session)
+        finally:
+            routing_state.reset(token)
+        self.assertFalse(state.wrote)
+        self.assertIn(self.route(state), ('replica', 'replica_copy'))
+
+    def test_writer_is_pinned(self):
+        user = User.objects.create_user(username='testuser', password='thepass123')
+        self.client.force_login(user)
+        response = self.client.post('/api/bulk/', [{'title': 'x', 'body': 'y'}],
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(ReplicaMiddleware.cookie_name, response.cookies)
+
+        middleware = ReplicaMiddleware(lambda request: routing_state.get())
+        request = RequestFactory().get('/api/')
+        self.assertFalse(middleware.get_state(request).pinned)
+        request.COOKIES[ReplicaMiddleware.cookie_name] = '1'
+        state = middleware.get_state(request)
+        self.assertTrue(state.pinned)
+        self.assertEqual(self.route(state), 'default')
@@ -1,8 +1,12 @@
 from django.urls import path
-from .views import ListTodo, DetailTodo
+from .views import AsyncDetailTodo, AsyncListTodo, BulkTodo, ListTodo, DetailTodo
 
 
 urlpatterns = [
     path('<int:pk>/', DetailTodo.as_view()),
+    path('bulk/', BulkTodo.as_view()),
+    # The same reads as coroutines, for ASGI deployments.
+    path('async/<int:pk>/', AsyncDetailTodo.as_view()),
+    path('async/', AsyncListTodo.as_view()),
     path('', ListTodo.as_view()),
 ]
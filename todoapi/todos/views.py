@@ -1,14 +1,67 @@
 from django.shortcuts import render
 from rest_framework import generics
+from rest_framework.authentication import BasicAuthentication, SessionAuthentication
+from rest_framework.permissions import IsAuthenticated
+from apikit.filters import IndexedFilterBackend
+from apikit.mixins import (
+    AsyncViewMixin, BulkWriteMixin, CachedListMixin, ConditionalGetMixin, SparseFieldsMixin,
+    StreamingListMixin, ValuesListMixin,
+)
 from .models import Todo
+from .pagination import TodoCursorPagination
 from .serializers import TodoSerializer
 
 
-class ListTodo(generics.ListAPIView):
+class ListTodo(CachedListMixin, ConditionalGetMixin, SparseFieldsMixin,
+               StreamingListMixin, ValuesListMixin, generics.ListAPIView):
+    cache_models = (Todo,)
     queryset = Todo.objects.all()
     serializer_class = TodoSerializer
+    pagination_class = TodoCursorPagination
+    filter_backends = (IndexedFilterBackend,)
+    filterset_fields = {
+        'title': ['exact', 'prefix'],
+        'updated_at': ['gt', 'gte', 'lt', 'lte'],
+    }
+    ordering_fields = ('id', 'title', 'updated_at')
 
 
-class DetailTodo(generics.RetrieveAPIView):
+class DetailTodo(ConditionalGetMixin, SparseFieldsMixin, generics.RetrieveAPIView):
     queryset = Todo.objects.all()
     serializer_class = TodoSerializer
+
+
+class AsyncListTodo(AsyncViewMixin, SparseFieldsMixin, generics.ListAPIView):
+    queryset = Todo.objects.all()
+    serializer_class = TodoSerializer
+    pagination_class = TodoCursorPagination
+    filter_backends = ListTodo.filter_backends
+    filterset_fields = ListTodo.filterset_fields
+    ordering_fields = ListTodo.ordering_fields
+
+    async def get(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+
+class AsyncDetailTodo(AsyncViewMixin, SparseFieldsMixin, generics.RetrieveAPIView):
+    queryset = Todo.objects.all()
+    serializer_class = TodoSerializer
+
+    async def get(self, request, *args, **kwargs):
+        return await self.aretrieve(request, *args, **kwargs)
+
+
+class BulkTodo(BulkWriteMixin, generics.GenericAPIView):
+    # The rest of the API is read-only and open to anyone, but writes need
+    # a user, whatever DEFAULT_AUTHENTICATION_CLASSES says.
+    authentication_classes = (SessionAuthentication, BasicAuthentication)
+    permission_classes = (IsAuthenticated,)
+    queryset = Todo.objects.all()
+    serializer_class = TodoSerializer
+    bulk_serializer_class = TodoSerializer
+
+    def post(self, request, *args, **kwargs):
+        return self.bulk_create(request, *args, **kwargs)
+
+    def patch(self, request, *args, **kwargs):
+        return self.bulk_update(request, *args, **kwargs)